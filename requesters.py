@@ -1,20 +1,52 @@
+import numpy as np
 import pandas as pd
 import glob
+import gzip
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
 import argparse
+import codecs
+import contextlib
 import csv
+import functools
+import itertools
 import json
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import resource
+except ImportError:  # לא קיים ב-Windows
+    resource = None
+
 # הגדרות גרסה
 VERSION = "2.1.0"
 
 
+# תבנית שמות קבצי הסריקה
+INPUT_GLOB = "scrape_docs_*.csv"
+
+
 def get_latest_input_file():
     """מחזיר את קובץ ה-CSV העדכני ביותר בתיקייה"""
-    files = glob.glob("scrape_docs_*.csv")
+    files = glob.glob(INPUT_GLOB)
     return sorted(files)[-1] if files else None
 
 
+def get_input_files(patterns=None):
+    """מחזיר את כל קבצי ה-CSV התואמים לתבניות (ברירת מחדל: כל קבצי הסריקה), מהישן לחדש"""
+    files = set()
+    for pattern in patterns or [INPUT_GLOB]:
+        files.update(glob.glob(pattern))
+    return sorted(files)
+
+
 def parse_csv_list(text):
     """משמש רק עבור רשימת המחברים (additional_authors) שעדיין קיימת"""
     if pd.isna(text) or not str(text).strip():
@@ -27,164 +59,1182 @@ def parse_csv_list(text):
         return []
 
 
-def classify_requester(name):
-    """סיווג המבקש"""
-    if not name: return "חברי כנסת ואחרים"
-    if "מרכז המחקר והמידע" in name:
-        return "מרכז המחקר והמידע"
-    if "הייעוץ המשפטי לכנסת" in name:
-        return "חברי כנסת ואחרים"
+def detect_encoding(path, sample_size=1 << 20):
+    """זיהוי קידוד הקובץ (utf-8 או cp1255) מתוך תחילת הקובץ בלבד"""
+    with open(path, 'rb') as f:
+        head = f.read(sample_size)
+    try:
+        # final=False כדי שתו רב-בתי שנחתך בסוף הדגימה לא ייחשב לשגיאה
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1255'
 
-    # כיוון שהשם כבר מנורמל ("ועדת X" ולא "הייעוץ ל..."), הבדיקה פשוטה יותר
-    if name.startswith("הוועדה") or name.startswith("ועדת"):
-        return "ועדות"
-    return "חברי כנסת ואחרים"
 
+# פורמטי התאריכים המוכרים בקבצי הפרויקט (סריקת ממ"מ, ועדות, הצעות חוק)
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d']
 
-def get_sorted_unique_list(list_of_lists):
-    unique_set = set()
-    for sublist in list_of_lists:
-        unique_set.update(sublist)
-    return sorted([x for x in unique_set if x])
 
+def detect_date_format(values, sample_size=200):
+    """זיהוי פורמט התאריך של עמודה מתוך מדגם של ערכים ייחודיים; None אם אף פורמט לא מתאים"""
+    sample = values.dropna().astype(str).str.strip()
+    sample = sample[sample != ''].drop_duplicates().head(sample_size)
+    if sample.empty:
+        return None
 
-def create_requesters_dashboard(df_exploded, years_data, unique_counts, details_map, output_name):
-    creation_time = datetime.now().strftime("%d-%b-%Y %H:%M")
+    matches = {fmt: pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum() for fmt in DATE_FORMATS}
+    best = max(matches, key=matches.get)
+    return best if matches[best] else None
 
-    chart_years = sorted(list(years_data.keys()))
 
-    dataset_mmm = []
-    dataset_committees = []
-    dataset_others = []
+# ערך שמתחיל בשנה מפוענח רק כ-ISO 8601 מלא, כדי ש-2020-13-01 ייספר כשגוי ולא יוסק ממנו 13 בינואר
+_YEAR_FIRST_RE = re.compile(r'^\d{4}\D')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_single_date(value):
+    """
+    פענוח ערך בודד שלא תאם את פורמט העמודה: קודם הפורמטים המוכרים, ואז ISO 8601 לערכים שמתחילים
+    בשנה או הסקה (יום לפני חודש) לכל השאר. ערך שלא פוענח מוחזר כ-NaT ונספר כשגוי.
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return pd.Timestamp(datetime.strptime(value, fmt))
+        except ValueError:
+            pass
+    if _YEAR_FIRST_RE.match(value):
+        parsed = pd.to_datetime(value, errors='coerce', format='ISO8601')
+        return parsed.tz_localize(None) if pd.notna(parsed) and parsed.tzinfo else parsed
+    return pd.to_datetime(value, errors='coerce', dayfirst=True)
+
+
+def parse_dates(values, date_format=None):
+    """
+    פענוח עמודת תאריכים בפורמט מפורש שמזוהה פעם אחת מתוך מדגם.
+    ערכים חריגים מפוענחים בנפרד, פעם אחת לכל ערך ייחודי.
+    מחזיר את העמודה המפוענחת ודוח: הפורמט, כמה שורות פוענחו בדרך החלופית וכמה לא פוענחו כלל.
+    """
+    date_format = date_format or detect_date_format(values)
+    if date_format:
+        parsed = pd.to_datetime(values, format=date_format, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    text = values.astype(object).where(values.notna(), '').map(str).str.strip()
+    outliers = parsed.isna() & (text != '')
+    if outliers.any():
+        fallback = {value: _parse_single_date(value) for value in text[outliers].unique()}
+        parsed = parsed.copy()
+        parsed[outliers] = pd.to_datetime(text[outliers].map(fallback))
+
+    failed = int((parsed.isna() & (text != '')).sum())
+    report = {
+        'formats': [date_format] if date_format else [],
+        'rows': len(values),
+        'fallback': int(outliers.sum()) - failed,
+        'failed': failed,
+    }
+    return parsed, report
+
+
+def parse_distinct_dates(values):
+    """
+    פענוח עמודת תאריכים שבה ערכים חוזרים (תאריכי מסמכים): כל תאריך ייחודי מפוענח פעם אחת
+    והתוצאה מוחזרת לשורות לפי קודי הקטגוריה. ערך חסר (קוד -1) מקבל את ה-NaT שנוסף בסוף.
+    """
+    dates = values.astype('category')
+    parsed, _ = parse_dates(pd.Series(dates.cat.categories, dtype=object))
+    parsed = np.append(parsed.to_numpy(), np.datetime64('NaT'))
+    return pd.Series(parsed[dates.cat.codes], index=values.index)
+
+
+def merge_date_reports(reports):
+    """איחוד דוחות פענוח תאריכים (ממקטעים או מכמה קבצים)"""
+    reports = [r for r in reports if r]
+    return {
+        'formats': sorted({fmt for r in reports for fmt in r['formats']}),
+        'rows': sum(r['rows'] for r in reports),
+        'fallback': sum(r['fallback'] for r in reports),
+        'failed': sum(r['failed'] for r in reports),
+    }
+
+
+def add_date_columns(df):
+    """הוספת עמודות date_dt ו-year לטבלת הקלט; מחזיר את הטבלה ואת דוח פענוח התאריכים"""
+    df['date_dt'], date_report = parse_dates(df['date'])
+    df['year'] = df['date_dt'].dt.year
+    return df, date_report
+
+
+# טבלת כללי הסיווג: (סוג התאמה, תבנית, סוג המבקש). הכלל הראשון שמתאים קובע.
+# כיוון שהשם כבר מנורמל ("ועדת X" ולא "הייעוץ ל..."), מספיקות בדיקות פשוטות
+REQUESTER_RULES = [
+    ('contains', "מרכז המחקר והמידע", "מרכז המחקר והמידע"),
+    ('contains', "הייעוץ המשפטי לכנסת", "חברי כנסת ואחרים"),
+    ('startswith', "הוועדה", "ועדות"),
+    ('startswith', "ועדת", "ועדות"),
+]
+DEFAULT_REQUESTER_TYPE = "חברי כנסת ואחרים"
+
+
+def classify_requester(name, rules=REQUESTER_RULES):
+    """סיווג המבקש לפי טבלת הכללים"""
+    if not name: return DEFAULT_REQUESTER_TYPE
+    for match, pattern, requester_type in rules:
+        if (match == 'contains' and pattern in name) or (match == 'startswith' and name.startswith(pattern)):
+            return requester_type
+    return DEFAULT_REQUESTER_TYPE
+
+
+def classify_requesters(names, rules=REQUESTER_RULES):
+    """סיווג עמודת שמות: כל שם ייחודי מסווג פעם אחת והתוצאה מוחזרת לשורות לפי קודי הקטגוריה"""
+    codes, uniques = pd.factorize(names)
+    types = np.array([classify_requester(name, rules) for name in uniques], dtype=object)
+    return pd.Series(types[codes], index=names.index, dtype=object)
+
+
+def _text_column(df, name):
+    """עמודת טקסט כמו str(row.get(name, '')) - ערך חסר הופך ל-'nan' ועמודה חסרה למחרוזת ריקה"""
+    if name not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    col = df[name].astype(object)
+    return col.where(col.notna(), 'nan').map(str)
+
+
+def _is_valid_text(series):
+    """מסכה לערכים שאינם ריקים ואינם 'nan'"""
+    return (series != '') & (series.str.lower() != 'nan')
+
+
+def _collect_authors(df):
+    """רשימת מחברים לכל שורה (author ואחריו additional_authors) בפעולות עמודה"""
+    main_authors = _text_column(df, 'author').str.strip()
+
+    extra = df['additional_authors'] if 'additional_authors' in df.columns else pd.Series('', index=df.index)
+    extra = extra.astype(object)
+    extra = extra[extra.notna()].map(str)
+    extra = extra[extra.str.strip() != '']
+
+    # ערכים עם מרכאות דורשים פענוח CSV מלא, כל השאר מתפצלים ישירות לפי פסיק
+    quoted = extra.str.contains('"', regex=False)
+    extra_items = pd.concat([
+        extra[~quoted].str.split(','),
+        extra[quoted].map(parse_csv_list),
+    ]).explode().dropna().astype(str).str.strip()
+
+    long_form = pd.concat([main_authors, extra_items])
+    long_form = long_form[_is_valid_text(long_form)]
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+
+    # author לפני additional_authors בכל שורה
+    positions = df.index.get_indexer(long_form.index)
+    return pd.Series(_lists_by_position(long_form.to_numpy(dtype=object), positions, len(df)),
+                     index=df.index, dtype=object)
+
+
+def _lists_by_position(values, positions, length):
+    """פיצול ערכים לרשימה לכל שורה לפי מיקום השורה (מיון יציב - הסדר בתוך כל שורה נשמר)"""
+    values = values[np.argsort(positions, kind='stable')]
+    bounds = np.cumsum(np.bincount(positions, minlength=length))[:-1]
+    return [part.tolist() for part in np.split(values, bounds)]
+
+
+def flatten_documents(df):
+    """
+    בניית טבלת המסמכים השטוחה (שורה לכל מסמך) בפעולות עמודה במקום לולאה על השורות.
+    האינדקס נשמר מטבלת הקלט. מחזיר את הטבלה ואת מספר השורות שדולגו בגלל שחסר בהן שם מבקש.
+    """
+    df = df[df['year'].notna()]
+
+    req_names = _text_column(df, 'requested_by_normalized').str.strip()
+    has_requester = _is_valid_text(req_names)
+    missing_requester_count = int((~has_requester).sum())
+
+    df = df[has_requester]
+    req_names = req_names[has_requester]
+
+    leaders = _text_column(df, 'teamleader').str.strip()
+    leaders = leaders.where(_is_valid_text(leaders), '').map(lambda x: [x] if x else [])
+
+    df_exploded = pd.DataFrame({
+        'year': df['year'].astype(int),
+        'date': _text_column(df, 'date'),
+        'title': _text_column(df, 'title').str.replace('"', '&quot;', regex=False),
+        'link': _text_column(df, 'link'),
+        'requester_name': req_names,
+        'requester_type': classify_requesters(req_names),
+        'authors': _collect_authors(df),
+        'teamleaders': leaders,
+    })
+
+    return df_exploded, missing_requester_count
+
+
+class MemberLists:
+    """
+    רשימות החברים (מחברים/ראשי צוותים) של כל שורה במבנה מערכי: קודים לטבלת שמות
+    משותפת וממוינת, והיסטים (offsets) שמסמנים היכן מתחילה הרשימה של כל שורה.
+    """
+
+    def __init__(self, lists):
+        lengths = np.fromiter((len(x) for x in lists), dtype=np.int64, count=len(lists))
+        self.offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        flat = pd.Series([x for items in lists for x in items], dtype=object)
+        codes, self.categories = pd.factorize(flat, sort=True)
+        self.codes = codes.astype(np.int32)
+
+    def explode(self, index):
+        """עמודה ארוכה (חבר אחד בכל שורה) עם תוויות השורות המקוריות"""
+        rows = np.repeat(np.asarray(index), np.diff(self.offsets))
+        return pd.Series(pd.Categorical.from_codes(self.codes, categories=self.categories), index=rows)
+
+    @property
+    def nbytes(self):
+        return int(self.offsets.nbytes + self.codes.nbytes + self.categories.memory_usage(deep=True))
+
+
+def _compact_strings(series, max_unique_ratio=0.5):
+    """המרה ל-category כאשר הערכים חוזרים על עצמם מספיק כדי שזה ישתלם"""
+    if len(series) and series.nunique() <= max_unique_ratio * len(series):
+        return series.astype('category')
+    return series
+
+
+class CompactDocuments:
+    """
+    ייצוג דחוס של הטבלה השטוחה: מחרוזות חוזרות כ-category, שנה כ-int16, תאריך מפוענח
+    כ-datetime64, ומחברים/ראשי צוותים ב-MemberLists במקום רשימות פייתון לכל שורה.
+    """
+
+    def __init__(self, df_exploded):
+        self.frame = pd.DataFrame({
+            'year': df_exploded['year'].astype(np.int16),
+            'date': _compact_strings(df_exploded['date']),
+            'date_dt': parse_distinct_dates(df_exploded['date']).to_numpy(),
+            'title': _compact_strings(df_exploded['title']),
+            'link': _compact_strings(df_exploded['link']),
+            'requester_name': df_exploded['requester_name'].astype('category'),
+            'requester_type': df_exploded['requester_type'].astype('category'),
+        }, index=df_exploded.index)
+        self.authors = MemberLists(df_exploded['authors'].tolist())
+        self.teamleaders = MemberLists(df_exploded['teamleaders'].tolist())
+
+    def member_series(self):
+        return {
+            'authors': self.authors.explode(self.frame.index),
+            'teamleaders': self.teamleaders.explode(self.frame.index),
+        }
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(index=True, deep=True).sum()
+                   + self.authors.nbytes + self.teamleaders.nbytes)
+
+
+def table_memory_bytes(df_exploded):
+    """גודל הטבלה השטוחה בזיכרון, כולל המחרוזות שבתוך עמודות הרשימות"""
+    total = int(df_exploded.memory_usage(index=True, deep=True).sum())
+    for column in ['authors', 'teamleaders']:
+        total += sum(sys.getsizeof(x) for items in df_exploded[column] for x in items)
+    return total
+
+
+def _doc_entry(date, title, link):
+    """
+    מסמך במודל. search הוא מפתח החיפוש (הכותרת באותיות קטנות ובלי &quot;), והוא נשמר
+    רק כשהוא שונה מהכותרת עצמה - בכותרות בעברית בלבד הם זהים.
+    """
+    doc = {'date': date, 'title': title, 'link': link}
+    search = title.replace('&quot;', '"').lower()
+    if search != title:
+        doc['search'] = search
+    return doc
+
+
+def _date_ranks(dates):
+    """דירוג תאריכי המסמכים מהחדש לישן ({תאריך: מקום}); תאריכים שלא פוענחו בסוף"""
+    dates = pd.Series(sorted(set(dates)), dtype=object)
+    parsed = parse_distinct_dates(dates)
+    newest_first = dates[parsed.sort_values(ascending=False, na_position='last', kind='stable').index]
+    return dict(zip(newest_first, range(len(newest_first))))
+
+
+def sort_docs_by_date(details_map):
+    """
+    מיון רשימת המסמכים של כל מבקש מהחדש לישן, כדי שהדף לא יצטרך למיין בפתיחת המודל.
+    המיון יציב ותאריכים שלא פוענחו נשארים בסוף.
+    """
+    ranks = _date_ranks(doc['date'] for details in details_map.values() for doc in details['docs'])
+    for details in details_map.values():
+        details['docs'].sort(key=lambda doc: ranks[doc['date']])
+    return details_map
 
-    for year in chart_years:
-        total = years_data[year]['total']
-        if total > 0:
-            dataset_mmm.append(round((years_data[year]['mmm'] / total) * 100, 1))
-            dataset_committees.append(round((years_data[year]['committees'] / total) * 100, 1))
-            dataset_others.append(round((years_data[year]['others'] / total) * 100, 1))
-        else:
-            dataset_mmm.append(0)
-            dataset_committees.append(0)
-            dataset_others.append(0)
 
-    # --- חישוב סטטיסטיקות לטבלה הראשית ---
-    stats = df_exploded.groupby(['requester_name', 'requester_type']).agg(
+def build_details_map(df_exploded):
+    """
+    מילון פרטי המבקשים עבור ה-Frontend: התפלגות שנים ורשימת מסמכים ייחודית לכל מבקש,
+    ממוינת מהחדש לישן. הכפילויות מזוהות לפי (מבקש, תאריך, כותרת, קישור).
+    """
+    details_map = {}
+
+    year_counts = df_exploded.groupby(['requester_name', 'year'], sort=False, observed=True).size()
+    for (name, year), count in year_counts.items():
+        details_map.setdefault(name, {'years': {}, 'docs': []})['years'][int(year)] = int(count)
+
+    unique_docs = df_exploded.drop_duplicates(subset=['requester_name', 'date', 'title', 'link'])
+    for name, date, title, link in zip(unique_docs['requester_name'], unique_docs['date'],
+                                       unique_docs['title'], unique_docs['link']):
+        details_map[name]['docs'].append(_doc_entry(date, title, link))
+
+    return sort_docs_by_date(details_map)
+
+
+# מפתח הקיבוץ של הטבלה הראשית
+REQUESTER_KEYS = ['requester_name', 'requester_type']
+
+
+def _explode_members(df_exploded, column, members=None):
+    """
+    פריסת עמודת רשימה (authors/teamleaders) לטבלה ארוכה של זוגות ייחודיים (מבקש, חבר).
+    members: עמודה פרוסה מוכנה (למשל מ-CompactDocuments) במקום עמודת הרשימות.
+    """
+    if members is None:
+        long_form = df_exploded[REQUESTER_KEYS + [column]].explode(column)
+    else:
+        long_form = df_exploded.loc[members.index, REQUESTER_KEYS].assign(**{column: members.to_numpy()})
+    long_form = long_form[long_form[column].notna() & (long_form[column] != '')]
+    return long_form.drop_duplicates()
+
+
+def _add_member_columns(stats, df_exploded, column, prefix, members=None):
+    """הוספת רשימה ממוינת ומספר ייחודיים של חברי העמודה לכל מבקש"""
+    long_form = _explode_members(df_exploded, column, members)
+    grouped = long_form.sort_values(column, kind='stable').groupby(REQUESTER_KEYS, observed=True)[column]
+    keys = pd.MultiIndex.from_frame(stats[REQUESTER_KEYS])
+
+    lists = grouped.agg(list).reindex(keys)
+    stats[f'{prefix}_list'] = [x if isinstance(x, list) else [] for x in lists]
+    stats[f'{prefix}_count'] = grouped.nunique().reindex(keys, fill_value=0).to_numpy()
+
+
+def compute_requester_stats(df_exploded, members=None, member_columns=('authors', 'teamleaders')):
+    """
+    חישוב סטטיסטיקות לטבלה הראשית - שורה לכל מבקש.
+    members: מילון עמודות חברים פרוסות (ראו CompactDocuments.member_series) לטבלה דחוסה.
+    member_columns: עמודות הרשימות שנספרות (unique_<column>_list/count); הממוצע הוא לפי הראשונה.
+    """
+    members = members or {}
+    stats = df_exploded.groupby(REQUESTER_KEYS, observed=True).agg(
         doc_count=('year', 'size'),
         min_year=('year', 'min'),
         max_year=('year', 'max'),
         active_years=('year', 'nunique'),
-        all_authors=('authors', lambda x: list(x)),
-        all_teamleaders=('teamleaders', lambda x: list(x))
     ).reset_index()
 
+    for column in member_columns:
+        _add_member_columns(stats, df_exploded, column, f'unique_{column}', members.get(column))
+    stats[REQUESTER_KEYS] = stats[REQUESTER_KEYS].astype(object)
+    return _finalize_requester_stats(stats, member_columns[0])
+
+
+def _finalize_requester_stats(stats, avg_column='authors'):
+    """עמודות נגזרות (ממוצע לשנה וממוצע לחבר בעמודה avg_column) ומיון לפי מספר המסמכים"""
     stats['avg_per_year'] = stats['doc_count'] / stats['active_years']
-    stats['unique_authors_list'] = stats['all_authors'].apply(get_sorted_unique_list)
-    stats['unique_teamleaders_list'] = stats['all_teamleaders'].apply(get_sorted_unique_list)
-    stats['unique_authors_count'] = stats['unique_authors_list'].apply(len)
-    stats['unique_teamleaders_count'] = stats['unique_teamleaders_list'].apply(len)
+    members_count = stats[f'unique_{avg_column}_count']
+    stats['avg_per_member'] = (stats['doc_count'] / members_count.where(members_count > 0)).fillna(0)
+
+    return stats.sort_values(by='doc_count', ascending=False)
+
+
+# הדשבורדים שנבנים מאותה טבלה שטוחה: column - עמודת החברים שלפיה מקובצים המסמכים (None - לפי מבקש).
+# member_columns - שתי עמודות המונים בטבלה (עמודה בטבלה השטוחה, כותרת); הממוצע (avg_header) הוא לפי הראשונה.
+# בדשבורדי החברים מוצגים המבקשים במקום עמודת הקיבוץ עצמה, שהייתה סופרת את החבר ואת שותפיו
+DASHBOARD_VIEWS = {
+    'requesters': {'column': None, 'page_title': 'ניתוח מבקשים', 'heading': 'ניתוח מבקשי מחקרים',
+                   'table_heading': 'פירוט וסטטיסטיקה למבקשים', 'name_header': 'שם המבקש', 'modal_prefix': 'תיק מבקש',
+                   'member_columns': [('authors', 'מחברים'), ('teamleaders', 'ראשי צוותים')],
+                   'avg_header': 'ממוצע למחבר'},
+    'authors': {'column': 'authors', 'page_title': 'ניתוח מחברים', 'heading': 'ניתוח מחברי מחקרים',
+                'table_heading': 'פירוט וסטטיסטיקה למחברים', 'name_header': 'שם המחבר', 'modal_prefix': 'תיק מחבר',
+                'member_columns': [('requesters', 'מבקשים'), ('teamleaders', 'ראשי צוותים')],
+                'avg_header': 'ממוצע למבקש'},
+    'teamleaders': {'column': 'teamleaders', 'page_title': 'ניתוח ראשי צוותים', 'heading': 'ניתוח ראשי צוותים',
+                    'table_heading': 'פירוט וסטטיסטיקה לראשי צוותים', 'name_header': 'שם ראש הצוות',
+                    'modal_prefix': 'תיק ראש צוות',
+                    'member_columns': [('requesters', 'מבקשים'), ('authors', 'מחברים')],
+                    'avg_header': 'ממוצע למבקש'},
+}
+
+
+def pivot_documents(df_exploded, column):
+    """
+    הטבלה השטוחה כשהמסמכים מקובצים לפי חברי העמודה (מחברים/ראשי צוותים) במקום לפי מבקש:
+    שורה לכל זוג (מסמך, חבר), כך שאותן פונקציות צבירה בונות גם את הדשבורדים האלה.
+    הסיווג של כל חבר הוא סוג המבקש שעבורו נכתבו מרב המסמכים שלו, והמבקש המקורי נשמר
+    כרשימה בעמודה requesters (למונה המבקשים של כל חבר).
+    """
+    members = df_exploded[column].explode()
+    members = members[members.notna() & (members != '')]
+    pivot = df_exploded.loc[members.index].reset_index(drop=True)
+    pivot['requesters'] = [[name] for name in pivot['requester_name']]
+    pivot['requester_name'] = members.to_numpy()
 
-    stats['avg_per_author'] = stats.apply(
-        lambda r: r['doc_count'] / r['unique_authors_count'] if r['unique_authors_count'] > 0 else 0, axis=1
-    )
+    type_counts = pivot.groupby(['requester_name', 'requester_type'], sort=False).size().reset_index(name='count')
+    main_types = type_counts.sort_values('count', ascending=False, kind='stable').drop_duplicates('requester_name')
+    pivot['requester_type'] = pivot['requester_name'].map(main_types.set_index('requester_name')['requester_type'])
+    return pivot
+
+
+def build_years_data(df_exploded):
+    """ספירת מסמכים לפי שנה וסוג מבקש עבור הגרף הראשי"""
+    counts = df_exploded.groupby(['year', 'requester_type'], observed=True).size()
+    return _years_data_from_counts({(int(y), t): int(n) for (y, t), n in counts.items()})
+
+
+def _years_data_from_counts(counts):
+    """המרת ספירות {(שנה, סוג): כמות} למבנה years_data של הדשבורד"""
+    years_data = {}
+    for year in sorted({y for y, _ in counts}):
+        mmm_count = counts.get((year, "מרכז המחקר והמידע"), 0)
+        comm_count = counts.get((year, "ועדות"), 0)
+        others_count = counts.get((year, "חברי כנסת ואחרים"), 0)
+        years_data[year] = {
+            'mmm': mmm_count,
+            'committees': comm_count,
+            'others': others_count,
+            'total': mmm_count + comm_count + others_count
+        }
+    return years_data
+
+
+def build_unique_counts(df_exploded):
+    """מספר המבקשים הייחודיים לכל סוג"""
+    return df_exploded.groupby('requester_type', observed=True)['requester_name'].nunique().to_dict()
+
+
+def _update_counts(counts, values, delta):
+    """הוספה (delta=1) או הסרה (delta=-1) של ערכים ממונה {ערך: כמות}; ערכים שירדו לאפס נמחקים"""
+    for value in values:
+        count = counts.get(value, 0) + delta
+        if count:
+            counts[value] = count
+        else:
+            del counts[value]
+
+
+class RequesterAggregator:
+    """
+    צבירה הדרגתית של נתוני המבקשים מתוך מקטעי קלט (chunks) עוקבים,
+    כך שאין צורך להחזיק בזיכרון את כל קובץ ה-CSV או את כל הטבלה השטוחה.
+    כל שורה נצברת לפי המפתח שלה (האינדקס בטבלה השטוחה) וניתן גם להסיר אותה, כך שהצבירה
+    החמה של מצב --watch מתעדכנת רק במסמכים שנוספו, השתנו או נמחקו. סדר המבקשים, השנים והמסמכים באותו
+    תאריך נקבע לפי מיקום השורות בקובץ, כמו בבנייה מהטבלה השטוחה המלאה.
+    """
 
-    stats = stats.sort_values(by='doc_count', ascending=False)
+    def __init__(self):
+        self.types = {}
+        self.year_counts = {}
+        # מבקש -> {מחבר/ראש צוות: מספר השורות שבהן הופיע}
+        self.authors = {}
+        self.teamleaders = {}
+        # מבקש -> {(תאריך, כותרת, קישור): {מפתח שורה: שנה}}
+        self.docs = {}
+        # מפתח שורה -> התרומה שלה (מבקש, שנה, מסמך, מחברים, ראשי צוותים), להסרה ולבניית הטבלה השטוחה
+        self.rows = {}
+        # מפתח שורה -> מיקומה בקובץ
+        self.positions = {}
+
+    @staticmethod
+    def _rows(df_exploded):
+        return zip(df_exploded.index, df_exploded['requester_name'], df_exploded['requester_type'],
+                   df_exploded['year'], df_exploded['date'], df_exploded['title'], df_exploded['link'],
+                   df_exploded['authors'], df_exploded['teamleaders'])
+
+    def add(self, df_exploded, positions=None):
+        """
+        הוספת שורות של הטבלה השטוחה (בפורמט של flatten_documents).
+        positions: מיקום השורות בקובץ (ברירת מחדל: האינדקס שלהן).
+        """
+        if df_exploded.empty:
+            return
+        self.positions.update(zip(df_exploded.index, df_exploded.index if positions is None else positions))
+
+        for key, name, req_type, year, date, title, link, authors, leaders in self._rows(df_exploded):
+            if name not in self.types:
+                self.types[name] = req_type
+                self.year_counts[name] = {}
+                self.authors[name] = {}
+                self.teamleaders[name] = {}
+                self.docs[name] = {}
+            year, doc = int(year), (date, title, link)
+            _update_counts(self.year_counts[name], [year], 1)
+            _update_counts(self.authors[name], authors, 1)
+            _update_counts(self.teamleaders[name], leaders, 1)
+            self.docs[name].setdefault(doc, {})[key] = year
+            self.rows[key] = (name, year, doc, authors, leaders)
+
+    def remove(self, keys):
+        """הסרת השורות שנוספו קודם עם המפתחות האלה (מפתחות שלא נוספו מדולגים)"""
+        for key in keys:
+            if key not in self.rows:
+                continue
+            name, year, doc, authors, leaders = self.rows.pop(key)
+            _update_counts(self.year_counts[name], [year], -1)
+            _update_counts(self.authors[name], authors, -1)
+            _update_counts(self.teamleaders[name], leaders, -1)
+            rows = self.docs[name][doc]
+            del rows[key]
+            if not rows:
+                del self.docs[name][doc]
+            self.positions.pop(key, None)
+            if not self.year_counts[name]:
+                for state in (self.types, self.year_counts, self.authors, self.teamleaders, self.docs):
+                    del state[name]
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+    def reorder(self, positions):
+        """עדכון מיקומי כל השורות ({מפתח: מיקום}) - שורות שלא השתנו עשויות לזוז בקובץ חדש"""
+        self.positions = positions
+
+    def documents(self):
+        """הטבלה השטוחה של כל השורות שנצברו (בפורמט של flatten_documents), לפי מיקומן בקובץ"""
+        keys = sorted(self.rows, key=self.positions.__getitem__)
+        rows = [self.rows[key] for key in keys]
+        names = [row[0] for row in rows]
+        return pd.DataFrame({
+            'year': np.array([row[1] for row in rows], dtype=int),
+            'date': [row[2][0] for row in rows],
+            'title': [row[2][1] for row in rows],
+            'link': [row[2][2] for row in rows],
+            'requester_name': names,
+            'requester_type': [self.types[name] for name in names],
+            'authors': [row[3] for row in rows],
+            'teamleaders': [row[4] for row in rows],
+        })
+
+    def details_map(self):
+        ranks = _date_ranks(date for docs in self.docs.values() for date, _, _ in docs)
+        positions = self.positions
+        details_map = []
+        for name, docs in self.docs.items():
+            entries = []
+            year_first = {}
+            for doc, rows in docs.items():
+                # כל השורות של מסמך חולקות את אותו תאריך ולכן גם את אותה שנה
+                first = min([positions[key] for key in rows])
+                year = next(iter(rows.values()))
+                if first < year_first.get(year, first + 1):
+                    year_first[year] = first
+                entries.append((ranks[doc[0]], first, doc))
+            # המיקום הראשון של כל מסמך ייחודי, ולכן המיון לא משווה בין המסמכים עצמם
+            entries.sort()
+            years = self.year_counts[name]
+            details_map.append((min(year_first.values()), name, {
+                'years': {year: years[year] for year in sorted(year_first, key=year_first.get)},
+                'docs': [_doc_entry(*doc) for _, _, doc in entries],
+            }))
+        details_map.sort(key=lambda item: item[0])
+        return {name: details for _, name, details in details_map}
+
+    def years_data(self):
+        counts = {}
+        for name, years in self.year_counts.items():
+            for year, count in years.items():
+                key = (year, self.types[name])
+                counts[key] = counts.get(key, 0) + count
+        return _years_data_from_counts(counts)
+
+    def unique_counts(self):
+        counts = {}
+        for req_type in self.types.values():
+            counts[req_type] = counts.get(req_type, 0) + 1
+        return counts
+
+    def stats(self):
+        rows = []
+        for name in sorted(self.types, key=lambda n: (n, self.types[n])):
+            years = self.year_counts[name]
+            authors = sorted(x for x in self.authors[name] if x)
+            leaders = sorted(x for x in self.teamleaders[name] if x)
+            rows.append({
+                'requester_name': name,
+                'requester_type': self.types[name],
+                'doc_count': sum(years.values()),
+                'min_year': min(years),
+                'max_year': max(years),
+                'active_years': len(years),
+                'unique_authors_list': authors,
+                'unique_authors_count': len(authors),
+                'unique_teamleaders_list': leaders,
+                'unique_teamleaders_count': len(leaders),
+            })
+        return _finalize_requester_stats(pd.DataFrame(rows))
+
+
+class StageProfiler:
+    """
+    מדידת זמן קיר, זמן מעבד וזיכרון שיא לכל שלב בריצה (במצב --profile).
+    שלב שנמדד כמה פעמים (למשל בקריאה במקטעים) נצבר לרשומה אחת.
+    מעקב הזיכרון (tracemalloc) מאט שלבים כבדי פייתון באופן לא אחיד, ולכן הוא מופעל רק לפי בקשה.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = {}
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                  'peak_traced_mb': None, 'peak_rss_mb': None})
+            entry['calls'] += 1
+            entry['wall_s'] += time.perf_counter() - start_wall
+            entry['cpu_s'] += time.process_time() - start_cpu
+            if self.trace_memory:
+                peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                entry['peak_traced_mb'] = max(entry['peak_traced_mb'] or 0.0, peak_mb)
+            entry['peak_rss_mb'] = _peak_rss_mb()
+
+    def report(self):
+        stages = {name: {key: round(value, 4) if isinstance(value, float) else value
+                         for key, value in entry.items()}
+                  for name, entry in self.stages.items()}
+        return {
+            'stages': stages,
+            'total_wall_s': round(sum(e['wall_s'] for e in self.stages.values()), 4),
+            'total_cpu_s': round(sum(e['cpu_s'] for e in self.stages.values()), 4),
+        }
+
+    def print_summary(self):
+        print(f"\n--- פרופיל ריצה ---")
+        for name, entry in self.stages.items():
+            traced = f"{entry['peak_traced_mb']:.1f}MB" if entry['peak_traced_mb'] is not None else "-"
+            print(f"{name:<15} wall {entry['wall_s']:8.3f}s  cpu {entry['cpu_s']:8.3f}s  peak {traced}")
+
+
+def _peak_rss_mb():
+    """שיא הזיכרון התושב של התהליך עד כה, אם זמין במערכת ההפעלה"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ב-macOS הערך בבתים, בלינוקס בקילובתים
+    return round(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10, 1)
+
+
+# מצבי הכתיבה של נתוני המודל: מוטמעים בדף, קובץ נפרד אחד, קובץ לכל מבקש, או קבצים עם גיבוב תוכן
+# (נתונים, עיצוב וסקריפט) בתיקיית ASSETS_DIR
+DATA_MODES = ['inline', 'external', 'sharded', 'assets']
 
-    html_table_rows = ""
-    for _, row in stats.iterrows():
-        type_badge_class = "bg-secondary"
-        if row['requester_type'] == "מרכז המחקר והמידע":
-            type_badge_class = "bg-primary"
-        elif row['requester_type'] == "ועדות":
-            type_badge_class = "bg-warning text-dark"
-        elif row['requester_type'] == "חברי כנסת ואחרים":
-            type_badge_class = "bg-success"
+# תיקיית הקבצים של מצב assets, לצד קובץ ה-HTML
+ASSETS_DIR = "requesters_assets"
 
-        avg_year_str = f"{row['avg_per_year']:.1f}"
-        avg_auth_str = f"{row['avg_per_author']:.1f}"
+# מקום זמן היצירה בדף במצב assets, כדי שגיבוב הדף לא ישתנה רק בגלל השעה
+CREATION_TIME_PLACEHOLDER = "@@CREATION_TIME@@"
 
-        authors_html = str(row['unique_authors_count'])
-        if row['unique_authors_count'] > 0:
-            authors_list_str = ", ".join(row['unique_authors_list']).replace('"', '&quot;')
-            authors_html = f'''<span class="interactive-count" data-bs-toggle="popover" title="מחברים ({row['unique_authors_count']})" data-bs-content="{authors_list_str}">{row['unique_authors_count']}</span>'''
 
-        leaders_html = str(row['unique_teamleaders_count'])
-        if row['unique_teamleaders_count'] > 0:
-            leaders_list_str = ", ".join(row['unique_teamleaders_list']).replace('"', '&quot;')
-            leaders_html = f'''<span class="interactive-count" data-bs-toggle="popover" title="ראשי צוותים ({row['unique_teamleaders_count']})" data-bs-content="{leaders_list_str}">{row['unique_teamleaders_count']}</span>'''
+def encode_details_map(details_map):
+    """
+    קידוד מילון (dictionary encoding) של פרטי המבקשים: כל תאריך/כותרת/קישור נשמר פעם אחת
+    בטבלת מחרוזות משותפת, וכל מסמך מיוצג כרביעיית מיקומים בטבלה (תאריך, כותרת, קישור, מפתח חיפוש).
+    """
+    strings = []
+    positions = {}
+
+    def code(value):
+        if value not in positions:
+            positions[value] = len(strings)
+            strings.append(value)
+        return positions[value]
+
+    requesters = {}
+    for name, details in details_map.items():
+        docs = []
+        for doc in details['docs']:
+            docs.extend((code(doc['date']), code(doc['title']), code(doc['link']),
+                         code(doc.get('search', doc['title']))))
+        requesters[name] = {'years': details['years'], 'docs': docs}
+
+    return {'strings': strings, 'requesters': requesters}
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w'):
+    """כתיבה לקובץ זמני והחלפת קובץ היעד בסיום (os.replace), כך שקורא לעולם לא רואה קובץ חלקי"""
+    # שם זמני לכל תהליך - כמה תהליכים במאגר עשויים לכתוב את אותו קובץ משותף
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_compact_json(path, data):
+    with atomic_write(path) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_details_payload(details_map, output_name, data_mode):
+    """
+    כתיבת נתוני המודל לצד קובץ ה-HTML (במצבים external/sharded).
+    מחזיר את תיאור מקור הנתונים שהדף משתמש בו לטעינה עצלה.
+    """
+    if data_mode == 'inline':
+        return {'mode': 'inline'}
+
+    base_path = os.path.splitext(output_name)[0] + '_data'
+    base_url = os.path.basename(base_path)
+
+    if data_mode == 'external':
+        _write_compact_json(base_path + '.json', encode_details_map(details_map))
+        return {'mode': 'external', 'url': base_url + '.json'}
+
+    # שם כל רסיס הוא גיבוב התוכן שלו, כך שעותק שנשמר במטמון הדפדפן מבנייה קודמת
+    # לעולם לא יוצג עבור מבקש אחר; רסיס שלא השתנה אינו נכתב מחדש
+    os.makedirs(base_path, exist_ok=True)
+    shards = {}
+    for name, details in details_map.items():
+        encoded = encode_details_map({name: details})
+        payload = json.dumps({'strings': encoded['strings'], **encoded['requesters'][name]},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        shards[name] = f"{content_hash(payload)}.json"
+        shard_path = os.path.join(base_path, shards[name])
+        if not os.path.exists(shard_path):
+            with atomic_write(shard_path, 'wb') as f:
+                f.write(payload)
+
+    # מחיקת רסיסים שנותרו מבנייה קודמת רק אחרי שהחדשים נכתבו
+    current = set(shards.values())
+    for old_shard in glob.glob(os.path.join(base_path, '*.json')):
+        if os.path.basename(old_shard) not in current:
+            os.remove(old_shard)
+    return {'mode': 'sharded', 'url': base_url + '/', 'shards': shards}
+
+
+def remove_other_mode_payloads(output_name, data_mode):
+    """
+    מחיקת שאריות של מצבי נתונים אחרים מבנייה קודמת של אותו דף, כדי שלא יפורסם לצדו
+    נתון שכבר אינו תואם: <output>_data.json (external), התיקייה <output>_data/ (sharded),
+    והדף הדחוס ונתוני המודל ב-ASSETS_DIR (assets). נקרא אחרי שהדף החדש נכתב.
+    """
+    base_path = os.path.splitext(output_name)[0] + '_data'
+    if data_mode != 'external' and os.path.exists(base_path + '.json'):
+        os.remove(base_path + '.json')
+    if data_mode != 'sharded' and os.path.isdir(base_path):
+        for shard in glob.glob(os.path.join(base_path, '*.json')):
+            os.remove(shard)
+        with contextlib.suppress(OSError):
+            os.rmdir(base_path)
+    if data_mode != 'assets':
+        if os.path.exists(output_name + '.gz'):
+            os.remove(output_name + '.gz')
+        remove_stale_asset_data(output_name)
+
+
+def content_hash(data):
+    """גיבוב קצר של התוכן (sha256) לשמות קבצים: רסיסי המודל וקובצי מצב assets"""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write_with_gzip(path, data):
+    """כתיבת הקובץ ולצדו גרסה דחוסה מראש (.gz, ללא חותמת זמן כדי שהתוכן יהיה יציב)"""
+    with atomic_write(path, 'wb') as f:
+        f.write(data)
+    with atomic_write(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, mtime=0))
+
+
+def write_hashed_asset(directory, prefix, extension, data):
+    """
+    כתיבת קובץ ששמו כולל את גיבוב התוכן (prefix.<hash>.ext). קובץ קיים באותו שם זהה בהגדרה
+    ולכן אינו נכתב שוב. מחזיר את שם הקובץ.
+    """
+    name = f"{prefix}.{content_hash(data)}{extension}"
+    path = os.path.join(directory, name)
+    if not (os.path.exists(path) and os.path.exists(path + '.gz')):
+        _write_with_gzip(path, data)
+    return name
 
-        # שם המבקש כקישור למודל
-        safe_name = row['requester_name'].replace("'", "\\'")
-        requester_link = f'<span class="clickable-name" onclick="openRequesterModal(\'{safe_name}\')">{row["requester_name"]}</span>'
 
-        html_table_rows += f"""
+def write_page_if_changed(path, chunks, creation_time):
+    """
+    כתיבה הדרגתית של דף ה-HTML (וגרסת .gz) לקבצים זמניים, תוך חישוב גיבוב התוכן בלי זמן היצירה.
+    הגיבוב נשמר כהערה בסוף הדף; אם הדף הקיים מסתיים באותה הערה הקבצים הזמניים נמחקים
+    והדף אינו מוחלף. מחזיר האם הדף נכתב.
+    """
+    digest = hashlib.sha256()
+    tmp_path, gz_tmp_path = f"{path}.{os.getpid()}.tmp", f"{path}.gz.{os.getpid()}.tmp"
+    try:
+        # filename='' כדי ששם הקובץ הזמני לא ייכתב לכותרת ה-gzip
+        with open(tmp_path, 'wb') as f, open(gz_tmp_path, 'wb') as gz_file, \
+                gzip.GzipFile(filename='', fileobj=gz_file, mode='wb', mtime=0) as gz:
+            for chunk in chunks:
+                digest.update(chunk.encode('utf-8'))
+                data = chunk.replace(CREATION_TIME_PLACEHOLDER, creation_time).encode('utf-8')
+                f.write(data)
+                gz.write(data)
+            marker = f"<!-- content-hash: {digest.hexdigest()[:12]} -->\n".encode('utf-8')
+            f.write(marker)
+            gz.write(marker)
+
+        if os.path.exists(path) and os.path.getsize(path) >= len(marker):
+            with open(path, 'rb') as f:
+                f.seek(-len(marker), os.SEEK_END)
+                if f.read() == marker:
+                    return False
+        os.replace(tmp_path, path)
+        os.replace(gz_tmp_path, path + '.gz')
+        return True
+    finally:
+        for leftover in (tmp_path, gz_tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def remove_stale_assets(directory, prefix, extension, keep=()):
+    """
+    מחיקת קבצים עם גיבוב תוכן (prefix.<hash>.ext וגרסאות ה-.gz) שאינם ב-keep.
+    כמה תהליכים במאגר עשויים למחוק את אותו קובץ ישן בו-זמנית, ולכן קובץ שכבר נמחק אינו שגיאה.
+    """
+    keep = {name for kept in keep for name in (kept, kept + '.gz')}
+    for old_file in glob.glob(os.path.join(directory, f"{glob.escape(prefix)}.*{extension}*")):
+        if os.path.basename(old_file) not in keep:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(old_file)
+
+
+def remove_stale_asset_data(output_name, keep=()):
+    """מחיקת קובצי נתוני המודל של הדף ב-ASSETS_DIR שאינם בשימוש (כולל גרסאות .gz)"""
+    assets_dir = os.path.join(os.path.dirname(output_name), ASSETS_DIR)
+    data_prefix = os.path.splitext(os.path.basename(output_name))[0] + '_data'
+    remove_stale_assets(assets_dir, data_prefix, '.json', keep)
+
+
+# צבע התג לכל סוג מבקש בטבלה הראשית
+TYPE_BADGE_CLASSES = {
+    "מרכז המחקר והמידע": "bg-primary",
+    "ועדות": "bg-warning text-dark",
+    "חברי כנסת ואחרים": "bg-success",
+}
+
+
+def _count_popover_column(counts, lists, title):
+    """מונה עם חלונית (popover) של הרשימה המלאה, או מספר בלבד אם הרשימה ריקה"""
+    cells = []
+    for count, items in zip(counts, lists):
+        if count > 0:
+            items_str = ", ".join(items).replace('"', '&quot;')
+            cells.append(f'''<span class="interactive-count" data-bs-toggle="popover" title="{title} ({count})" data-bs-content="{items_str}">{count}</span>''')
+        else:
+            cells.append(str(count))
+    return cells
+
+
+def _iter_table_rows(stats, view='requesters'):
+    """מחולל שורות הטבלה הראשית מתוך עמודות שחושבו מראש עבור כל הטבלה"""
+    badge_classes = stats['requester_type'].map(TYPE_BADGE_CLASSES).fillna("bg-secondary")
+    avg_year_strs = stats['avg_per_year'].map('{:.1f}'.format)
+    avg_member_strs = stats['avg_per_member'].map('{:.1f}'.format)
+    (first_column, first_title), (second_column, second_title) = DASHBOARD_VIEWS[view]['member_columns']
+    first_cells = _count_popover_column(stats[f'unique_{first_column}_count'],
+                                        stats[f'unique_{first_column}_list'], first_title)
+    second_cells = _count_popover_column(stats[f'unique_{second_column}_count'],
+                                         stats[f'unique_{second_column}_list'], second_title)
+
+    # שם המבקש כקישור למודל
+    safe_names = stats['requester_name'].str.replace("'", "\\'", regex=False)
+
+    for (name, safe_name, req_type, badge_class, doc_count, min_year, max_year, active_years,
+         avg_year_str, first_html, avg_member_str, second_html) in zip(
+            stats['requester_name'], safe_names, stats['requester_type'], badge_classes,
+            stats['doc_count'], stats['min_year'], stats['max_year'], stats['active_years'],
+            avg_year_strs, first_cells, avg_member_strs, second_cells):
+        yield f"""
         <tr>
-            <td class="fw-bold">{requester_link}</td>
-            <td><span class="badge {type_badge_class}">{row['requester_type']}</span></td>
-            <td class="text-center bg-light fw-bold">{row['doc_count']}</td>
-            <td class="text-center">{row['min_year']}</td>
-            <td class="text-center">{row['max_year']}</td>
-            <td class="text-center">{row['active_years']}</td>
+            <td class="fw-bold"><span class="clickable-name" onclick="openRequesterModal('{safe_name}')">{name}</span></td>
+            <td><span class="badge {badge_class}">{req_type}</span></td>
+            <td class="text-center bg-light fw-bold">{doc_count}</td>
+            <td class="text-center">{min_year}</td>
+            <td class="text-center">{max_year}</td>
+            <td class="text-center">{active_years}</td>
             <td class="text-center">{avg_year_str}</td>
-            <td class="text-center">{authors_html}</td>
-            <td class="text-center">{avg_auth_str}</td>
-            <td class="text-center">{leaders_html}</td>
+            <td class="text-center">{first_html}</td>
+            <td class="text-center">{avg_member_str}</td>
+            <td class="text-center">{second_html}</td>
         </tr>"""
 
-    hebrew_i18n = """{
-        "sProcessing": "מעבד...", "sLengthMenu": "הצג _MENU_ פריטים", "sZeroRecords": "לא נמצאו רשומות",
-        "sSearch": "חיפוש:", "oPaginate": { "sFirst": "ראשון", "sPrevious": "קודם", "sNext": "הבא", "sLast": "אחרון" }
-    }"""
 
-    html_template = f"""
-    <!DOCTYPE html>
-    <html lang="he" dir="rtl">
-    <head>
-        <meta charset="UTF-8">
-        <title>Gilat AI - ניתוח מבקשים</title>
-        <link rel="stylesheet" href="https://cdn.datatables.net/1.13.6/css/jquery.dataTables.min.css">
-        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/bootstrap/5.3.0/css/bootstrap.rtl.min.css">
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body {{ background-color: #f0f2f5; font-family: 'Segoe UI', Tahoma, sans-serif; padding: 15px; }}
-            .main-card {{ background: white; padding: 25px; border-radius: 12px; box-shadow: 0 5px 20px rgba(0,0,0,0.05); margin-bottom: 20px; }}
+# עיצוב הדף והסקריפט שלו. אינם תלויים בנתוני הריצה (אלה מגיעים מ-requesterPage ומ-requesterDetails),
+# ולכן במצב --assets הם נכתבים לקבצים נפרדים עם גיבוב תוכן שהדפדפן שומר במטמון
+PAGE_STYLE = """
+            body { background-color: #f0f2f5; font-family: 'Segoe UI', Tahoma, sans-serif; padding: 15px; }
+            .main-card { background: white; padding: 25px; border-radius: 12px; box-shadow: 0 5px 20px rgba(0,0,0,0.05); margin-bottom: 20px; }
 
-            .header-row {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px; border-bottom: 2px solid #f0f2f5; padding-bottom: 10px; }}
-            .header-right {{ display: flex; align-items: center; gap: 15px; }}
-            .header-right h2 {{ color: #1a73e8; font-weight: 800; margin: 0; padding-right: 12px; border-right: 5px solid #1a73e8; }}
-            .header-left-meta {{ color: #9aa0a6; font-size: 0.75rem; font-family: monospace; }}
+            .header-row { display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px; border-bottom: 2px solid #f0f2f5; padding-bottom: 10px; }
+            .header-right { display: flex; align-items: center; gap: 15px; }
+            .header-right h2 { color: #1a73e8; font-weight: 800; margin: 0; padding-right: 12px; border-right: 5px solid #1a73e8; }
+            .header-left-meta { color: #9aa0a6; font-size: 0.75rem; font-family: monospace; }
 
-            .nav-btn {{ text-decoration: none; background: #fff; color: #1a73e8; border: 1px solid #1a73e8; padding: 5px 15px; border-radius: 20px; font-weight: bold; font-size: 0.85rem; transition: 0.2s; cursor: pointer; }}
-            .nav-btn:hover {{ background: #1a73e8; color: white; }}
+            .nav-btn { text-decoration: none; background: #fff; color: #1a73e8; border: 1px solid #1a73e8; padding: 5px 15px; border-radius: 20px; font-weight: bold; font-size: 0.85rem; transition: 0.2s; cursor: pointer; }
+            .nav-btn:hover { background: #1a73e8; color: white; }
 
-            .chart-container {{ position: relative; height: 400px; width: 100%; margin-bottom: 30px; }}
-            h4 {{ color: #5f6368; font-weight: 700; margin-bottom: 15px; font-size: 1.1rem; }}
+            .chart-container { position: relative; height: 400px; width: 100%; margin-bottom: 30px; }
+            h4 { color: #5f6368; font-weight: 700; margin-bottom: 15px; font-size: 1.1rem; }
 
-            .custom-legend {{ display: flex; gap: 20px; justify-content: center; margin-bottom: 15px; flex-wrap: wrap; }}
-            .legend-item {{ 
+            .custom-legend { display: flex; gap: 20px; justify-content: center; margin-bottom: 15px; flex-wrap: wrap; }
+            .legend-item { 
                 display: flex; align-items: center; gap: 8px; cursor: pointer; 
                 padding: 5px 12px; border-radius: 20px; border: 1px solid transparent; transition: 0.2s; background: #f8f9fa;
-            }}
-            .legend-item:hover {{ background: #e9ecef; border-color: #dee2e6; transform: translateY(-2px); }}
-            .legend-color {{ width: 12px; height: 12px; border-radius: 50%; display: inline-block; }}
-            .legend-count {{ font-weight: bold; color: #555; margin-right: 4px; }}
-            .active-filter {{ border-color: #000; background: #e2e6ea; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+            }
+            .legend-item:hover { background: #e9ecef; border-color: #dee2e6; transform: translateY(-2px); }
+            .legend-color { width: 12px; height: 12px; border-radius: 50%; display: inline-block; }
+            .legend-count { font-weight: bold; color: #555; margin-right: 4px; }
+            .active-filter { border-color: #000; background: #e2e6ea; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+
+            table.dataTable thead th { background-color: #f8f9fa; border-bottom: 2px solid #dee2e6; font-size: 0.85rem; }
+            table.dataTable tbody td { font-size: 0.9rem; vertical-align: middle; }
+
+            .interactive-count { cursor: help; text-decoration: underline; text-decoration-style: dotted; color: #0d6efd; font-weight: bold; }
+            .interactive-count:hover { color: #0a58ca; }
+
+            .clickable-name { color: #0d6efd; cursor: pointer; font-weight: 700; }
+            .clickable-name:hover { text-decoration: underline; color: #0a58ca; }
+"""
+
+PAGE_SCRIPT = """            const requesterTableLanguage = {
+                "sProcessing": "מעבד...", "sLengthMenu": "הצג _MENU_ פריטים", "sZeroRecords": "לא נמצאו רשומות",
+                "sSearch": "חיפוש:", "oPaginate": { "sFirst": "ראשון", "sPrevious": "קודם", "sNext": "הבא", "sLast": "אחרון" }
+            };
+            let requesterDataPromise = null;
+            let dataTable;
+            let detailedChart = null; // גרף יחיד למודל - מתעדכן בכל פתיחה ולא נבנה מחדש
+
+            // רשימת המסמכים במודל: ממוינת מראש מהחדש לישן ומוצגת בעמודים
+            const DOCS_PAGE_SIZE = 20;
+            let modalDocs = [];
+            let modalFilteredDocs = [];
+            let modalPage = 0;
+
+            function filterTable(type, element) {
+                $('.legend-item').removeClass('active-filter');
+                $(element).addClass('active-filter');
+                if (dataTable) { dataTable.column(1).search(type).draw(); }
+            }
 
-            table.dataTable thead th {{ background-color: #f8f9fa; border-bottom: 2px solid #dee2e6; font-size: 0.85rem; }}
-            table.dataTable tbody td {{ font-size: 0.9rem; vertical-align: middle; }}
+            function resetTableFilter(element) {
+                $('.legend-item').removeClass('active-filter');
+                if (dataTable) { dataTable.column(1).search('').draw(); }
+            }
+
+            // פענוח רשימת המסמכים מקידוד המילון (רביעיות של מיקומים בטבלת המחרוזות)
+            function decodeRequesterDocs(strings, codes) {
+                const docs = [];
+                for (let i = 0; i < codes.length; i += 4) {
+                    docs.push({ date: strings[codes[i]], title: strings[codes[i + 1]], link: strings[codes[i + 2]],
+                                 search: strings[codes[i + 3]] });
+                }
+                return docs;
+            }
+
+            function loadRequesterDetails(name) {
+                if (requesterDetails[name] || requesterDataSource.mode === 'inline') {
+                    return Promise.resolve(requesterDetails[name]);
+                }
+                if (requesterDataSource.mode === 'sharded') {
+                    const shard = requesterDataSource.shards[name];
+                    if (!shard) return Promise.resolve(undefined);
+                    return fetch(requesterDataSource.url + shard).then(r => r.json()).then(payload => {
+                        requesterDetails[name] = { years: payload.years, docs: decodeRequesterDocs(payload.strings, payload.docs) };
+                        return requesterDetails[name];
+                    });
+                }
+                if (!requesterDataPromise) {
+                    requesterDataPromise = fetch(requesterDataSource.url).then(r => r.json());
+                }
+                return requesterDataPromise.then(payload => {
+                    const entry = payload.requesters[name];
+                    if (!entry) return undefined;
+                    requesterDetails[name] = { years: entry.years, docs: decodeRequesterDocs(payload.strings, entry.docs) };
+                    return requesterDetails[name];
+                });
+            }
+
+            // פונקציה לפתיחת המודל הספציפי
+            function openRequesterModal(name) {
+                loadRequesterDetails(name).then(data => showRequesterModal(name, data));
+            }
+
+            function showRequesterModal(name, data) {
+                if (!data) return;
+
+                // עדכון כותרת
+                $('#requesterModalTitle').text(requesterPage.modalPrefix + name);
+
+                // 1. עדכון הגרף (אותו מופע, רק הנתונים מתחלפים)
+                const years = Object.keys(data.years).sort();
+                const counts = years.map(y => data.years[y]);
+
+                if (detailedChart) {
+                    detailedChart.data.labels = years;
+                    detailedChart.data.datasets[0].data = counts;
+                    detailedChart.update();
+                } else {
+                    const ctx = document.getElementById('requesterSpecificChart').getContext('2d');
+                    detailedChart = new Chart(ctx, {
+                        type: 'bar',
+                        data: {
+                            labels: years,
+                            datasets: [{
+                                label: 'מספר מסמכים',
+                                data: counts,
+                                backgroundColor: '#0d6efd'
+                            }]
+                        },
+                        options: {
+                            responsive: true, maintainAspectRatio: false,
+                            scales: { y: { beginAtZero: true, ticks: { stepSize: 1 } } }
+                        }
+                    });
+                }
+
+                // 2. עדכון הטבלה - המסמכים כבר ממוינים, מוצג רק העמוד הנוכחי
+                modalDocs = data.docs;
+                $('#requesterDocsSearch').val('');
+                filterModalDocs('');
+
+                bootstrap.Modal.getOrCreateInstance(document.getElementById('singleRequesterModal')).show();
+            }
+
+            function renderModalDocs() {
+                const start = modalPage * DOCS_PAGE_SIZE;
+                const rows = modalFilteredDocs.slice(start, start + DOCS_PAGE_SIZE).map(doc => {
+                    const linkHtml = doc.link ? `<a href="${doc.link}" target="_blank">🔗 צפייה</a>` : '-';
+                    return `<tr><td>${doc.date}</td><td>${doc.title}</td><td>${linkHtml}</td></tr>`;
+                });
+                document.querySelector('#requesterDocsTable tbody').innerHTML =
+                    rows.join('') || '<tr><td colspan="3" class="text-center">לא נמצאו רשומות</td></tr>';
+
+                const pages = Math.max(1, Math.ceil(modalFilteredDocs.length / DOCS_PAGE_SIZE));
+                $('#requesterDocsInfo').text(`עמוד ${modalPage + 1} מתוך ${pages} (${modalFilteredDocs.length} מסמכים)`);
+                $('#requesterDocsPrev').prop('disabled', modalPage === 0);
+                $('#requesterDocsNext').prop('disabled', modalPage >= pages - 1);
+            }
+
+            // חיפוש לפי מפתח החיפוש שחושב מראש (או הכותרת עצמה כשהם זהים) ולפי התאריך
+            function filterModalDocs(query) {
+                const q = query.trim().toLowerCase();
+                modalFilteredDocs = q ? modalDocs.filter(doc => (doc.search || doc.title).includes(q) || doc.date.includes(q))
+                                      : modalDocs;
+                modalPage = 0;
+                renderModalDocs();
+            }
+
+            function changeModalPage(delta) {
+                modalPage += delta;
+                renderModalDocs();
+            }
+
+            $(document).ready(function() {
+                $('[data-bs-toggle="popover"]').popover({ trigger: 'hover', placement: 'auto', html: true });
+
+                dataTable = $('#requestersTable').DataTable({
+                    "language": requesterTableLanguage, "order": [[ 2, "desc" ]], "pageLength": 15
+                });
+
+                dataTable.on('draw', function () {
+                    $('[data-bs-toggle="popover"]').popover({ trigger: 'hover', placement: 'left', html: true });
+                });
+
+                // הגרף הראשי
+                const ctx = document.getElementById('requestersChart').getContext('2d');
+                new Chart(ctx, {
+                    type: 'line',
+                    data: {
+                        labels: requesterPage.chart.labels,
+                        datasets: [
+                            { label: 'מרכז המחקר והמידע', data: requesterPage.chart.mmm, borderColor: '#0d6efd', backgroundColor: '#0d6efd', tension: 0.3, fill: false },
+                            { label: 'ועדות', data: requesterPage.chart.committees, borderColor: '#ffc107', backgroundColor: '#ffc107', tension: 0.3, fill: false },
+                            { label: 'חברי כנסת ואחרים', data: requesterPage.chart.others, borderColor: '#198754', backgroundColor: '#198754', tension: 0.3, fill: false }
+                        ]
+                    },
+                    options: {
+                        responsive: true, maintainAspectRatio: false, interaction: { mode: 'index', intersect: false },
+                        plugins: { legend: { display: false }, tooltip: { callbacks: { label: function(context) { return context.dataset.label + ': ' + context.parsed.y + '%'; } } } },
+                        scales: { x: { stacked: false }, y: { stacked: false, beginAtZero: true, max: 100, ticks: { callback: function(value) { return value + "%" } } } }
+                    }
+                });
+            });
+"""
+
+
+def _render_page_sections(years_data, unique_counts, data_source, view='requesters', caption=None, assets=None,
+                          creation_time=None):
+    """
+    הכנת חלקי הדף הקבועים: ראש הדף עד גוף הטבלה, הסקריפטים עד הנתונים, וסוף הדף.
+    caption: תיאור הפרוסה (למשל "הכנסת ה-25") שמתווסף לכותרת הדף.
+    assets: כתובות קובצי העיצוב והסקריפט ({'style', 'script'}) במקום הטמעתם בדף.
+    """
+    labels = DASHBOARD_VIEWS[view]
+    caption_text = f" - {caption}" if caption else ""
+    creation_time = creation_time or datetime.now().strftime("%d-%b-%Y %H:%M")
+
+    chart_years = sorted(list(years_data.keys()))
 
-            .interactive-count {{ cursor: help; text-decoration: underline; text-decoration-style: dotted; color: #0d6efd; font-weight: bold; }}
-            .interactive-count:hover {{ color: #0a58ca; }}
+    dataset_mmm = []
+    dataset_committees = []
+    dataset_others = []
 
-            .clickable-name {{ color: #0d6efd; cursor: pointer; font-weight: 700; }}
-            .clickable-name:hover {{ text-decoration: underline; color: #0a58ca; }}
-        </style>
+    for year in chart_years:
+        total = years_data[year]['total']
+        if total > 0:
+            dataset_mmm.append(round((years_data[year]['mmm'] / total) * 100, 1))
+            dataset_committees.append(round((years_data[year]['committees'] / total) * 100, 1))
+            dataset_others.append(round((years_data[year]['others'] / total) * 100, 1))
+        else:
+            dataset_mmm.append(0)
+            dataset_committees.append(0)
+            dataset_others.append(0)
+
+    if assets:
+        style_html = f'<link rel="stylesheet" href="{assets["style"]}">'
+    else:
+        style_html = f"<style>{PAGE_STYLE}        </style>"
+
+    page_head = f"""
+    <!DOCTYPE html>
+    <html lang="he" dir="rtl">
+    <head>
+        <meta charset="UTF-8">
+        <title>Gilat AI - {labels['page_title']}{caption_text}</title>
+        <link rel="stylesheet" href="https://cdn.datatables.net/1.13.6/css/jquery.dataTables.min.css">
+        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/bootstrap/5.3.0/css/bootstrap.rtl.min.css">
+        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+        {style_html}
     </head>
     <body>
         <div class="main-card">
             <div class="header-row">
                 <div class="header-right">
-                    <h2>📊 ניתוח מבקשי מחקרים</h2>
+                    <h2>📊 {labels['heading']}{caption_text}</h2>
                     <a href="analyze_docs.html" class="nav-btn">🔙 חזרה לראשי</a>
                 </div>
                 <div class="header-left-meta">
@@ -213,26 +1263,28 @@ def create_requesters_dashboard(df_exploded, years_data, unique_counts, details_
         </div>
 
         <div class="main-card">
-            <h4>פירוט וסטטיסטיקה למבקשים</h4>
+            <h4>{labels['table_heading']}</h4>
             <div class="alert alert-info py-1 px-3 mb-3 d-inline-block" style="font-size: 0.9rem;">
-                💡 טיפ: לחץ על שם המבקש לפרטים מלאים, ורחף מעל המונים למידע נוסף.
+                💡 טיפ: לחץ על {labels['name_header']} לפרטים מלאים, ורחף מעל המונים למידע נוסף.
             </div>
             <table id="requestersTable" class="display table table-sm table-hover" style="width:100%">
                 <thead>
                     <tr>
-                        <th style="width: 20%">שם המבקש</th>
+                        <th style="width: 20%">{labels['name_header']}</th>
                         <th style="width: 15%">סיווג</th>
                         <th class="text-center">מסמכים</th>
                         <th class="text-center">משנה</th>
                         <th class="text-center">עד שנה</th>
                         <th class="text-center">שנות פעילות</th>
                         <th class="text-center">ממוצע לשנה</th>
-                        <th class="text-center">מחברים</th>
-                        <th class="text-center">ממוצע למחבר</th>
-                        <th class="text-center">ראשי צוותים</th>
+                        <th class="text-center">{labels['member_columns'][0][1]}</th>
+                        <th class="text-center">{labels['avg_header']}</th>
+                        <th class="text-center">{labels['member_columns'][1][1]}</th>
                     </tr>
                 </thead>
-                <tbody>{html_table_rows}</tbody>
+                <tbody>"""
+
+    page_scripts = f"""</tbody>
             </table>
         </div>
 
@@ -249,11 +1301,22 @@ def create_requesters_dashboard(df_exploded, years_data, unique_counts, details_
                         <canvas id="requesterSpecificChart"></canvas>
                     </div>
                     <div class="col-12">
-                        <h5>📜 רשימת מסמכים</h5>
+                        <div class="d-flex justify-content-between align-items-center mb-2">
+                            <h5 class="m-0">📜 רשימת מסמכים</h5>
+                            <input type="search" id="requesterDocsSearch" class="form-control form-control-sm" style="max-width: 250px;"
+                                   placeholder="חיפוש..." oninput="filterModalDocs(this.value)">
+                        </div>
                         <table id="requesterDocsTable" class="table table-sm table-striped table-hover" style="width:100%">
                             <thead><tr><th>תאריך</th><th>כותרת המסמך</th><th>קישור</th></tr></thead>
                             <tbody></tbody>
                         </table>
+                        <div class="d-flex justify-content-between align-items-center">
+                            <span id="requesterDocsInfo" class="text-muted small"></span>
+                            <div>
+                                <button type="button" id="requesterDocsPrev" class="btn btn-sm btn-outline-secondary" onclick="changeModalPage(-1)">קודם</button>
+                                <button type="button" id="requesterDocsNext" class="btn btn-sm btn-outline-secondary" onclick="changeModalPage(1)">הבא</button>
+                            </div>
+                        </div>
                     </div>
                 </div>
               </div>
@@ -266,242 +1329,958 @@ def create_requesters_dashboard(df_exploded, years_data, unique_counts, details_
         <script src="https://cdn.datatables.net/1.13.6/js/jquery.dataTables.min.js"></script>
         <script src="https://cdnjs.cloudflare.com/ajax/libs/bootstrap/5.3.0/js/bootstrap.bundle.min.js"></script>
         <script>
-            // נתונים מלאים המוזרקים מהפייתון
-            const requesterDetails = {json.dumps(details_map)};
-            let dataTable;
-            let detailedChart = null; // משתנה גלובלי לגרף הספציפי
+            // נתונים מלאים המוזרקים מהפייתון (במצב inline), אחרת נטענים מקובץ הנתונים בפתיחת המודל
+            const requesterDetails = """
+
+    page_config = {
+        'modalPrefix': labels['modal_prefix'] + ': ',
+        'chart': {'labels': chart_years, 'mmm': dataset_mmm, 'committees': dataset_committees, 'others': dataset_others},
+    }
+    script_body = '' if assets else PAGE_SCRIPT
+    script_tag = f'\n        <script src="{assets["script"]}"></script>' if assets else ''
+
+    page_tail = f""";
+            const requesterDataSource = {json.dumps(data_source)};
+            const requesterPage = {json.dumps(page_config, ensure_ascii=False)};
+{script_body}        </script>{script_tag}
+    </body>
+    </html>
+    """
 
-            function filterTable(type, element) {{
-                $('.legend-item').removeClass('active-filter');
-                $(element).addClass('active-filter');
-                if (dataTable) {{ dataTable.column(1).search(type).draw(); }}
-            }}
+    return page_head, page_scripts, page_tail
 
-            function resetTableFilter(element) {{
-                $('.legend-item').removeClass('active-filter');
-                if (dataTable) {{ dataTable.column(1).search('').draw(); }}
-            }}
 
-            // פונקציה לפתיחת המודל הספציפי
-            function openRequesterModal(name) {{
-                const data = requesterDetails[name];
-                if (!data) return;
+def create_requesters_dashboard(stats, years_data, unique_counts, details_map, output_name, data_mode='inline',
+                                profiler=None, view='requesters', caption=None):
+    profiler = profiler or StageProfiler(enabled=False)
+    if data_mode == 'assets':
+        return _create_assets_dashboard(stats, years_data, unique_counts, details_map, output_name, profiler,
+                                        view, caption)
 
-                // עדכון כותרת
-                $('#requesterModalTitle').text('תיק מבקש: ' + name);
+    with profiler.stage('render'):
+        data_source = write_details_payload(details_map, output_name, data_mode)
+        page_head, page_scripts, page_tail = _render_page_sections(years_data, unique_counts, data_source, view,
+                                                                   caption)
 
-                // 1. עדכון הגרף
-                const ctx = document.getElementById('requesterSpecificChart').getContext('2d');
-                if (detailedChart) {{ detailedChart.destroy(); }}
+    # כתיבה הדרגתית של הדף: ראש, שורות הטבלה, סקריפטים ונתונים (לקובץ זמני שמחליף את הקודם בסיום)
+    with profiler.stage('write'), atomic_write(output_name) as f:
+        f.write(page_head)
+        f.writelines(_iter_table_rows(stats, view))
+        f.write(page_scripts)
+        if data_mode == 'inline':
+            json.dump(details_map, f)
+        else:
+            f.write('{}')
+        f.write(page_tail)
 
-                const years = Object.keys(data.years).sort();
-                const counts = years.map(y => data.years[y]);
+    remove_other_mode_payloads(output_name, data_mode)
+    print(f"✅ קובץ הניתוח נוצר בהצלחה: {output_name}")
 
-                detailedChart = new Chart(ctx, {{
-                    type: 'bar',
-                    data: {{
-                        labels: years,
-                        datasets: [{{
-                            label: 'מספר מסמכים',
-                            data: counts,
-                            backgroundColor: '#0d6efd'
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true, maintainAspectRatio: false,
-                        scales: {{ y: {{ beginAtZero: true, ticks: {{ stepSize: 1 }} }} }}
-                    }}
-                }});
-
-                // 2. עדכון הטבלה
-                if ($.fn.DataTable.isDataTable('#requesterDocsTable')) {{
-                    $('#requesterDocsTable').DataTable().destroy();
-                }}
-
-                const tbody = $('#requesterDocsTable tbody');
-                tbody.empty();
-                data.docs.forEach(doc => {{
-                    const linkHtml = doc.link ? `<a href="${{doc.link}}" target="_blank">🔗 צפייה</a>` : '-';
-                    tbody.append(`<tr><td>${{doc.date}}</td><td>${{doc.title}}</td><td>${{linkHtml}}</td></tr>`);
-                }});
-
-                $('#requesterDocsTable').DataTable({{
-                    "language": {hebrew_i18n},
-                    "order": [[ 0, "desc" ]],
-                    "pageLength": 10
-                }});
-
-                const modal = new bootstrap.Modal(document.getElementById('singleRequesterModal'));
-                modal.show();
-            }}
-
-            $(document).ready(function() {{
-                $('[data-bs-toggle="popover"]').popover({{ trigger: 'hover', placement: 'auto', html: true }});
-
-                dataTable = $('#requestersTable').DataTable({{
-                    "language": {hebrew_i18n}, "order": [[ 2, "desc" ]], "pageLength": 15
-                }});
-
-                dataTable.on('draw', function () {{
-                    $('[data-bs-toggle="popover"]').popover({{ trigger: 'hover', placement: 'left', html: true }});
-                }});
 
-                // הגרף הראשי
-                const ctx = document.getElementById('requestersChart').getContext('2d');
-                new Chart(ctx, {{
-                    type: 'line',
-                    data: {{
-                        labels: {json.dumps(chart_years)},
-                        datasets: [
-                            {{ label: 'מרכז המחקר והמידע', data: {json.dumps(dataset_mmm)}, borderColor: '#0d6efd', backgroundColor: '#0d6efd', tension: 0.3, fill: false }},
-                            {{ label: 'ועדות', data: {json.dumps(dataset_committees)}, borderColor: '#ffc107', backgroundColor: '#ffc107', tension: 0.3, fill: false }},
-                            {{ label: 'חברי כנסת ואחרים', data: {json.dumps(dataset_others)}, borderColor: '#198754', backgroundColor: '#198754', tension: 0.3, fill: false }}
-                        ]
-                    }},
-                    options: {{
-                        responsive: true, maintainAspectRatio: false, interaction: {{ mode: 'index', intersect: false }},
-                        plugins: {{ legend: {{ display: false }}, tooltip: {{ callbacks: {{ label: function(context) {{ return context.dataset.label + ': ' + context.parsed.y + '%'; }} }} }} }},
-                        scales: {{ x: {{ stacked: false }}, y: {{ stacked: false, beginAtZero: true, max: 100, ticks: {{ callback: function(value) {{ return value + "%" }} }} }} }}
-                    }}
-                }});
-            }});
-        </script>
-    </body>
-    </html>
+def _create_assets_dashboard(stats, years_data, unique_counts, details_map, output_name, profiler, view, caption):
+    """
+    מצב assets: נתוני המודל, העיצוב והסקריפט נכתבים לקבצים נפרדים ב-ASSETS_DIR ששמם כולל גיבוב
+    של התוכן, כך שהדפדפן שומר במטמון כל מה שלא השתנה. כל קובץ נכתב גם בגרסת .gz, וקובץ
+    שתוכנו לא השתנה (כולל הדף עצמו) לא נכתב מחדש. העיצוב והסקריפט משותפים לכל הדשבורדים.
+    """
+    assets_dir = os.path.join(os.path.dirname(output_name), ASSETS_DIR)
+    os.makedirs(assets_dir, exist_ok=True)
+    data_prefix = os.path.splitext(os.path.basename(output_name))[0] + '_data'
+
+    with profiler.stage('render'):
+        payload = json.dumps(encode_details_map(details_map), ensure_ascii=False, separators=(',', ':'))
+        data_name = write_hashed_asset(assets_dir, data_prefix, '.json', payload.encode('utf-8'))
+        style_name = write_hashed_asset(assets_dir, 'requesters', '.css', PAGE_STYLE.encode('utf-8'))
+        script_name = write_hashed_asset(assets_dir, 'requesters', '.js', PAGE_SCRIPT.encode('utf-8'))
+        assets = {'style': f"{ASSETS_DIR}/{style_name}", 'script': f"{ASSETS_DIR}/{script_name}"}
+        data_source = {'mode': 'external', 'url': f"{ASSETS_DIR}/{data_name}"}
+        page_head, page_scripts, page_tail = _render_page_sections(years_data, unique_counts, data_source, view,
+                                                                   caption, assets, CREATION_TIME_PLACEHOLDER)
+
+    # כתיבה הדרגתית כמו בשאר המצבים; הגיבוב מחושב תוך כדי כתיבה
+    with profiler.stage('write'):
+        chunks = itertools.chain([page_head], _iter_table_rows(stats, view), [page_scripts, '{}', page_tail])
+        written = write_page_if_changed(output_name, chunks, datetime.now().strftime("%d-%b-%Y %H:%M"))
+        # קובצי נתונים קודמים של אותו דף, ועיצוב וסקריפט מגרסה קודמת של הקוד, כבר אינם בשימוש
+        remove_stale_asset_data(output_name, keep=(data_name,))
+        remove_other_mode_payloads(output_name, data_mode='assets')
+        remove_stale_assets(assets_dir, 'requesters', '.css', keep=(style_name,))
+        remove_stale_assets(assets_dir, 'requesters', '.js', keep=(script_name,))
+
+    if written:
+        print(f"✅ קובץ הניתוח נוצר בהצלחה: {output_name}")
+    else:
+        print(f"♻️ קובץ הניתוח לא השתנה: {output_name}")
+
+
+def view_output_name(output_name, view):
+    """שם קובץ הדשבורד של התצוגה או הפרוסה: requesters.html, requesters_authors.html, requesters_k25.html וכו'"""
+    if view == 'requesters':
+        return output_name
+    base, ext = os.path.splitext(output_name)
+    return f"{base}_{view}{ext}"
+
+
+def _build_view_dashboard(view, df_exploded, years_data, output_name, data_mode, profiler=None, caption=None):
+    """
+    צבירה ובניית הדשבורד של תצוגת חברים אחת מתוך הטבלה השטוחה המשותפת
+    (מופעל גם בתהליך נפרד במאגר התהליכים). דליי השנים משותפים לכל התצוגות.
+    """
+    profiler = profiler or StageProfiler(enabled=False)
+    with profiler.stage(f'{view}_aggregate'):
+        pivot = pivot_documents(df_exploded, DASHBOARD_VIEWS[view]['column'])
+        if pivot.empty:
+            print(f"⚠️ אין נתונים לדשבורד {view}, מדלג")
+            return None
+        details_map = build_details_map(pivot)
+        unique_counts = build_unique_counts(pivot)
+        stats = compute_requester_stats(pivot, member_columns=[c for c, _ in DASHBOARD_VIEWS[view]['member_columns']])
+    create_requesters_dashboard(stats, years_data, unique_counts, details_map, output_name, data_mode,
+                                profiler, view, caption)
+    return output_name
+
+
+def build_dashboards(result, views, output_name, data_mode='inline', jobs=None, profiler=None, caption=None):
+    """
+    בניית כמה דשבורדים מקליטה אחת: דשבורד המבקשים מהנתונים שכבר נצברו, ודשבורדי
+    המחברים/ראשי הצוותים מאותה טבלה שטוחה (result['documents']) ומאותם דליי שנים.
+    עם יותר מתצוגת חברים אחת ו-jobs שונה מ-1 התצוגות נבנות במקביל במאגר תהליכים.
+    """
+    profiler = profiler or StageProfiler(enabled=False)
+    member_views = [v for v in views if v != 'requesters']
+
+    executor = None
+    if len(member_views) > 1 and jobs != 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        futures = [executor.submit(_build_view_dashboard, view, result['documents'], result['years_data'],
+                                   view_output_name(output_name, view), data_mode, None, caption)
+                   for view in member_views]
+
+    if 'requesters' in views:
+        create_requesters_dashboard(result['stats'], result['years_data'], result['unique_counts'],
+                                    result['details_map'], output_name, data_mode, profiler, caption=caption)
+
+    if executor:
+        with profiler.stage('views_parallel'):
+            for future in futures:
+                future.result()
+        executor.shutdown()
+    else:
+        for view in member_views:
+            _build_view_dashboard(view, result['documents'], result['years_data'],
+                                  view_output_name(output_name, view), data_mode, profiler, caption)
+
+
+# תאריכי ההשבעה של הכנסות (לפילוח --by-knesset); מסמך משויך לכנסת האחרונה שהושבעה עד תאריכו
+KNESSET_TERMS = {
+    15: '1999-06-07', 16: '2003-02-17', 17: '2006-04-17', 18: '2009-02-24', 19: '2013-02-05',
+    20: '2015-03-31', 21: '2019-04-30', 22: '2019-10-03', 23: '2020-03-16', 24: '2021-04-06',
+    25: '2022-11-15',
+}
+
+
+def knesset_terms(dates):
+    """מספר הכנסת של כל תאריך מפוענח (0 לתאריך חסר או כזה שקודם לכנסת הראשונה בטבלה)"""
+    terms = np.array(list(KNESSET_TERMS))
+    starts = pd.to_datetime(list(KNESSET_TERMS.values())).to_numpy()
+    positions = np.searchsorted(starts, dates.to_numpy(dtype='datetime64[ns]'), side='right') - 1
+    values = np.where((positions >= 0) & dates.notna().to_numpy(), terms[positions.clip(0)], 0)
+    return pd.Series(values, index=dates.index)
+
+
+def rolling_windows(first_year, last_year, size, step=1):
+    """
+    חלונות שנים מתגלגלים בגודל size, מעוגנים לשנה האחרונה כך שהחלון העדכני תמיד מלא:
+    למשל (2023, 2026), (2022, 2025)... כל עוד החלון מתחיל אחרי first_year.
     """
+    starts = range(last_year - size + 1, first_year - 1, -step)
+    windows = [(start, start + size - 1) for start in starts]
+    return sorted(windows) or [(first_year, last_year)]
 
-    with open(output_name, 'w', encoding='utf-8') as f:
-        f.write(html_template)
-    print(f"✅ קובץ הניתוח נוצר בהצלחה: {output_name}")
 
+def year_slice_label(first, last):
+    """התווית (לשם הקובץ) והתיאור (לכותרת) של פרוסת שנים"""
+    label = f"{first}-{last}" if first != last else str(first)
+    return label, f"שנים {label}"
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--input")
-    args = parser.parse_args()
 
-    input_file = args.input if args.input else get_latest_input_file()
-    if not input_file: return print("❌ שגיאה: לא נמצא קובץ CSV.")
+def slice_documents(df_exploded, years=None, by_knesset=False, window=None, window_step=1):
+    """
+    חלוקת הטבלה השטוחה לפרוסות: טווחי שנים ((ראשונה, אחרונה) מ-parse_year_range), חלונות מתגלגלים
+    ו/או כנסות. מחזיר מילון {תווית: (תיאור לכותרת, טבלה)}; התווית משמשת בשם הקובץ (2020-2026, k25).
+    """
+    ranges = list(years or [])
+    if window:
+        ranges += rolling_windows(int(df_exploded['year'].min()), int(df_exploded['year'].max()), window, window_step)
 
-    print(f"קורא נתונים מקובץ: {input_file}...")
-    try:
-        df = pd.read_csv(input_file, encoding='utf-8')
-    except:
-        df = pd.read_csv(input_file, encoding='cp1255')
+    slices = {}
+    for first, last in ranges:
+        label, caption = year_slice_label(first, last)
+        slices[label] = (caption, df_exploded[df_exploded['year'].between(first, last)])
+
+    if by_knesset:
+        terms = knesset_terms(parse_distinct_dates(df_exploded['date'])).to_numpy()
+        for term in sorted(set(terms) - {0}):
+            slices[f"k{term}"] = (f"הכנסת ה-{term}", df_exploded[terms == term])
+    return slices
 
-    df['date_dt'] = pd.to_datetime(df['date'], errors='coerce')
-    df['year'] = df['date_dt'].dt.year
 
-    # חישוב תאריכים לסטטיסטיקה
-    min_date = df['date_dt'].min().strftime('%d/%m/%Y') if not df['date_dt'].isnull().all() else "N/A"
-    max_date = df['date_dt'].max().strftime('%d/%m/%Y') if not df['date_dt'].isnull().all() else "N/A"
+def _build_slice_dashboards(df_slice, views, output_name, data_mode, caption):
+    """צבירה ובניית הדשבורדים של פרוסה אחת (מופעל בתהליך נפרד במאגר התהליכים)"""
+    result = {}
+    _aggregate_frame(df_slice, result, StageProfiler(enabled=False))
+    build_dashboards(result, views, output_name, data_mode, jobs=1, caption=caption)
+    return output_name
 
-    flattened_data = []
 
-    # מונה לשורות ללא מבקש
-    missing_requester_count = 0
+def build_sliced_dashboards(df_exploded, slices, views, output_name, data_mode='inline', jobs=None):
+    """
+    בניית דשבורד נפרד לכל פרוסה (<output>_<label>.html) מאותה טבלה שטוחה, בלי לקרוא מחדש את הקלט.
+    הפרוסות נצברות ונכתבות במקביל במאגר תהליכים (אלא אם jobs=1).
+    """
+    tasks = []
+    for label, (caption, df_slice) in slices.items():
+        if df_slice.empty:
+            print(f"⚠️ אין מסמכים בפרוסה {label}, מדלג")
+            continue
+        tasks.append((df_slice, views, view_output_name(output_name, label), data_mode, caption))
 
-    for _, row in df.iterrows():
-        year = row['year']
-        if pd.isna(year): continue
-        year = int(year)
+    if len(tasks) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_build_slice_dashboards, *task) for task in tasks]
+            return [future.result() for future in futures]
+    return [_build_slice_dashboards(*task) for task in tasks]
 
-        # איסוף מחברים (שדה שעדיין מכיל רשימה ב-CSV)
-        doc_authors_raw = [str(row.get('author', '')).strip()]
-        doc_authors_raw.extend([x for x in parse_csv_list(row.get('additional_authors', ''))])
-        doc_authors = [a for a in doc_authors_raw if a and a.lower() != 'nan']
 
-        # איסוף ראש צוות
-        leader = str(row.get('teamleader', '')).strip()
-        doc_leaders = [leader] if leader and leader.lower() != 'nan' else []
+# גרסת מבנה המטמון - יש להעלות כאשר משתנה מבנה התוצאות השמורות
+CACHE_VERSION = 3
 
-        # קריאת שם המבקש (השדה המנורמל והיחיד כעת)
-        req_name = str(row.get('requested_by_normalized', '')).strip()
 
-        # דילוג וספירה אם אין שם מבקש
-        if not req_name or req_name.lower() == 'nan':
-            missing_requester_count += 1
-            continue
+def file_digest(path):
+    """טביעת אצבע (sha256) של תוכן הקובץ"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-        req_type = classify_requester(req_name)
-
-        # הוספה לרשימה (שורה אחת לכל מסמך)
-        flattened_data.append({
-            'year': year,
-            'date': str(row['date']),
-            'title': str(row['title']).replace('"', '&quot;'),
-            'link': str(row['link']),
-            'requester_name': req_name,
-            'requester_type': req_type,
-            'authors': doc_authors,
-            'teamleaders': doc_leaders
-        })
 
-    df_exploded = pd.DataFrame(flattened_data)
+def extract_rid(links):
+    """חילוץ מזהה המסמך (פרמטר rid) מתוך עמודת הקישורים"""
+    return links.astype(object).where(links.notna(), '').map(str).str.extract(r'[?&]rid=(\d+)', expand=False)
 
-    if df_exploded.empty:
-        print("לא נמצאו נתוני מבקשים תקינים.")
-        # גם אם לא מצאנו כלום, עדיין כדאי להדפיס סטטיסטיקה
-        print(f"\n--- סטטיסטיקה ---")
-        print(f"סה\"כ שורות שנקראו: {len(df)}")
-        print(f"שורות תקינות (עם מבקש): 0")
-        print(f"שורות פגומות (ללא מבקש): {missing_requester_count}")
-        print(f"טווח תאריכים: {min_date} - {max_date}")
-        return
 
-    # הכנת המילון המלא עבור ה-Frontend
-    details_map = {}
-    for _, row in df_exploded.iterrows():
-        name = row['requester_name']
-        if name not in details_map:
-            details_map[name] = {'years': {}, 'docs': []}
-
-        y = int(row['year'])
-        details_map[name]['years'][y] = details_map[name]['years'].get(y, 0) + 1
-
-        doc_entry = {
-            'date': row['date'],
-            'title': row['title'],
-            'link': row['link']
-        }
-        if doc_entry not in details_map[name]['docs']:
-            details_map[name]['docs'].append(doc_entry)
+class DocumentCache:
+    """
+    מטמון מתמשך של תוצאות הריצה האחרונה לפי טביעת האצבע של קובץ הקלט: כשהקובץ לא השתנה
+    הדשבורד נבנה מהתוצאות השמורות בלי לקרוא ולעבד אותו מחדש.
+    בלי path המטמון נשמר בזיכרון בלבד (מצב --watch).
+    """
 
-    unique_counts = df_exploded.groupby('requester_type')['requester_name'].nunique().to_dict()
+    def __init__(self, path=None):
+        self.path = path
+        self.file_digest = None
+        self.result = None
 
-    years_agg = df_exploded.groupby(['year', 'requester_type']).size().unstack(fill_value=0)
-    for col in ["מרכז המחקר והמידע", "ועדות", "חברי כנסת ואחרים"]:
-        if col not in years_agg.columns:
-            years_agg[col] = 0
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') == CACHE_VERSION:
+                self.file_digest = cached['file_digest']
+                self.result = cached['result']
 
-    years_data = {}
-    for year, row in years_agg.iterrows():
-        mmm_count = int(row["מרכז המחקר והמידע"])
-        comm_count = int(row["ועדות"])
-        others_count = int(row["חברי כנסת ואחרים"])
-        total = mmm_count + comm_count + others_count
-        years_data[int(year)] = {
-            'mmm': mmm_count,
-            'committees': comm_count,
-            'others': others_count,
-            'total': total
+    def save(self, file_digest, result):
+        """
+        שמירת התוצאות של הקובץ הנוכחי, בזיכרון ובדיסק (אם הוגדר path).
+        הטבלה השטוחה המלאה (result['documents']) נשמרת בזיכרון בלבד.
+        """
+        self.file_digest, self.result = file_digest, result
+
+        if self.path:
+            with atomic_write(self.path, 'wb') as f:
+                pickle.dump({
+                    'version': CACHE_VERSION,
+                    'file_digest': file_digest,
+                    'result': {key: value for key, value in result.items() if key != 'documents'},
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# עמודות הקלט שמשפיעות על עיבוד המסמך; שינוי באחת מהן (או בשנה שפוענחה) מחייב עיבוד מחדש
+ROW_SOURCE_COLUMNS = ['date', 'title', 'author', 'additional_authors', 'teamleader',
+                      'requested_by_normalized', 'link']
+
+
+class IncrementalAggregator:
+    """
+    צבירה חמה בזיכרון (מצב --watch): RequesterAggregator שנשמר בין הבניות, ולצידו הסטטוס של כל
+    שורה וגיבוב של עמודות המקור שלה, לפי מפתח השורה - ה-rid שבקישור (או גיבוב השורה כשאין rid)
+    ומספר ההופעה שלו בקובץ. בקובץ חדש רק שורות שנוספו או שהשתנו עוברות דרך flatten_documents,
+    ורק הן והשורות שנמחקו מעדכנות את הצבירה.
+    """
+
+    def __init__(self):
+        self.aggregator = RequesterAggregator()
+        self.records = pd.DataFrame(columns=['status', 'row_hash'])
+        self.reused_rows = 0
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._keys = []
+        self._new_records = []
+        self._new_documents = []
+        self._occurrences = pd.Series(dtype=int)
+
+    def update(self, df):
+        """רישום מקטע של הקובץ הנוכחי (אחרי add_date_columns); שורות חדשות או ששונו מעובדות מיד"""
+        columns = [c for c in ROW_SOURCE_COLUMNS if c in df.columns] + ['year']
+        row_hashes = pd.util.hash_pandas_object(df[columns].astype(object), index=False).set_axis(df.index)
+        rids = extract_rid(_text_column(df, 'link'))
+        base = rids.copy()
+        base[rids.isna()] = 'h' + row_hashes[rids.isna()].astype(str)
+        # מספר ההופעה ממשיך בין המקטעים, כך ש-rid כפול מקבל מפתח נפרד לכל הופעה (ההופעה הראשונה בלי סיומת)
+        occurrence = base.groupby(base, sort=False).cumcount()
+        if len(self._occurrences):
+            occurrence += base.map(self._occurrences).fillna(0).astype(int)
+        self._occurrences = base.value_counts().add(self._occurrences, fill_value=0).astype(int)
+        keys = base.where(occurrence == 0, base + '#' + occurrence.astype(str))
+
+        changed = pd.Series(True, index=df.index)
+        known = keys.isin(self.records.index).to_numpy()
+        changed[known] = self.records['row_hash'].reindex(keys[known]).to_numpy() != row_hashes[known].to_numpy()
+
+        df = df[changed]
+        df_exploded, _ = flatten_documents(df)
+        status = pd.Series('missing_requester', index=df.index)
+        status[df['year'].isna()] = 'no_year'
+        status[df_exploded.index] = 'ok'
+        self._keys.append(keys)
+        self._new_records.append(pd.DataFrame({'status': status, 'row_hash': row_hashes[changed]})
+                                 .set_axis(keys[changed]))
+        self._new_documents.append(df_exploded.set_axis(keys.loc[df_exploded.index]))
+
+    def apply(self):
+        """
+        עדכון הצבירה לפי כל המקטעים שנרשמו: הסרת התרומה של שורות שנמחקו או שהשתנו והוספת
+        השורות החדשות. מחזיר את מספר השורות ללא מבקש בקובץ הנוכחי.
+        """
+        keys = pd.concat(self._keys)
+        new_records = pd.concat(self._new_records)
+        stale = ~self.records.index.isin(keys) | self.records.index.isin(new_records.index)
+        positions = dict(zip(keys, range(len(keys))))
+
+        self.aggregator.remove(self.records.index[stale & (self.records['status'] == 'ok').to_numpy()])
+        for documents in self._new_documents:
+            self.aggregator.add(documents, documents.index.map(positions))
+        self.aggregator.reorder(positions)
+
+        parts = [part for part in (self.records[~stale], new_records) if len(part)]
+        self.records = pd.concat(parts) if parts else new_records
+        self.reused_rows = len(keys) - len(new_records)
+        self._reset_pending()
+        return int((self.records['status'] == 'missing_requester').sum())
+
+
+class DocumentStore:
+    """
+    מאגר מסמכים מקומי ב-SQLite, שמשמש מקור יחיד לבניית הדשבורדים.
+    קבצי סריקה נטענים אליו פעם אחת (לפי טביעת האצבע של הקובץ), ומסמך שמופיע שוב
+    (לפי rid) מתעדכן. שליפות לפי מבקש ולפי טווח שנים נעשות על אינדקסים.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS committees (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS requesters (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            type TEXT NOT NULL,
+            committee_id INTEGER REFERENCES committees(id)
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            doc_key TEXT NOT NULL UNIQUE,
+            rid INTEGER,
+            date TEXT,
+            date_iso TEXT,
+            year INTEGER,
+            title TEXT,
+            link TEXT,
+            requester_id INTEGER REFERENCES requesters(id),
+            source_file TEXT
+        );
+        CREATE TABLE IF NOT EXISTS authors (
+            document_id INTEGER NOT NULL REFERENCES documents(id),
+            role TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS loads (
+            file_digest TEXT PRIMARY KEY,
+            source_file TEXT,
+            rows INTEGER,
+            loaded_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_documents_rid ON documents(rid);
+        CREATE INDEX IF NOT EXISTS idx_documents_year ON documents(year);
+        CREATE INDEX IF NOT EXISTS idx_documents_requester_year ON documents(requester_id, year);
+        CREATE INDEX IF NOT EXISTS idx_authors_document ON authors(document_id, role, position);
+        CREATE INDEX IF NOT EXISTS idx_authors_name ON authors(name);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def load_scrape(self, input_file):
+        """טעינת קובץ סריקה למאגר; מחזיר את מספר השורות שנטענו (0 אם הקובץ כבר נטען)"""
+        digest = file_digest(input_file)
+        if self.conn.execute("SELECT 1 FROM loads WHERE file_digest = ?", (digest,)).fetchone():
+            return 0
+
+        df, _ = add_date_columns(pd.read_csv(input_file, encoding=detect_encoding(input_file)))
+        df_exploded, _ = flatten_documents(df)
+        rids = extract_rid(_text_column(df, 'link'))
+
+        # כל השורות נשמרות (גם ללא שנה או ללא מבקש) כדי שהסיכום יתאים לקובץ המקורי
+        docs = df_exploded.reindex(df.index)
+        for column in ['date', 'title', 'link']:
+            raw = _text_column(df, column)
+            if column == 'title':
+                raw = raw.str.replace('"', '&quot;', regex=False)
+            docs[column] = docs[column].fillna(raw)
+        docs['rid'] = rids
+        docs['date_iso'] = df['date_dt'].dt.strftime('%Y-%m-%d')
+        docs['doc_key'] = np.where(
+            rids.notna(), 'rid:' + rids.fillna(''),
+            'doc:' + pd.util.hash_pandas_object(
+                docs[['requester_name', 'date', 'title', 'link']].astype(object).fillna(''), index=False).astype(str))
+        docs['year'] = df['year']
+
+        # rid שחוזר באותו קובץ הוא אותו מסמך: נשמרת השורה האחרונה, וגם המחברים נלקחים רק ממנה
+        docs = docs[~docs['doc_key'].duplicated(keep='last')]
+        df_exploded = df_exploded[df_exploded.index.isin(docs.index)]
+
+        with self.conn:
+            requester_ids = self._upsert_requesters(df_exploded)
+            self.conn.executemany(
+                """INSERT INTO documents (doc_key, rid, date, date_iso, year, title, link, requester_id, source_file)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(doc_key) DO UPDATE SET
+                       rid = excluded.rid, date = excluded.date, date_iso = excluded.date_iso,
+                       year = excluded.year, title = excluded.title, link = excluded.link,
+                       requester_id = excluded.requester_id, source_file = excluded.source_file""",
+                [(key, int(rid) if isinstance(rid, str) else None, date, date_iso if isinstance(date_iso, str) else None,
+                  int(year) if pd.notna(year) else None, title, link,
+                  requester_ids.get(name) if isinstance(name, str) else None, input_file)
+                 for key, rid, date, date_iso, year, title, link, name in zip(
+                    docs['doc_key'], docs['rid'], docs['date'], docs['date_iso'], docs['year'],
+                    docs['title'], docs['link'], docs['requester_name'])])
+
+            doc_ids = dict(self.conn.execute("SELECT doc_key, id FROM documents WHERE source_file = ?",
+                                             (input_file,)))
+            loaded_ids = [(doc_ids[key],) for key in docs['doc_key']]
+            self.conn.executemany("DELETE FROM authors WHERE document_id = ?", loaded_ids)
+            self.conn.executemany(
+                "INSERT INTO authors (document_id, role, position, name) VALUES (?, ?, ?, ?)",
+                [(doc_ids[key], role, position, name)
+                 for role, column in [('author', 'authors'), ('teamleader', 'teamleaders')]
+                 for key, names in zip(docs.loc[df_exploded.index, 'doc_key'], df_exploded[column])
+                 for position, name in enumerate(names)])
+            self.conn.execute("INSERT INTO loads VALUES (?, ?, ?, ?)",
+                              (digest, input_file, len(df), datetime.now().isoformat(timespec='seconds')))
+        return len(df)
+
+    def _upsert_requesters(self, df_exploded):
+        """הוספת מבקשים חדשים (וועדות לטבלת הוועדות); מחזיר מיפוי שם -> מזהה"""
+        requesters = df_exploded[REQUESTER_KEYS].drop_duplicates()
+        committees = requesters.loc[requesters['requester_type'] == "ועדות", 'requester_name']
+        self.conn.executemany("INSERT OR IGNORE INTO committees (name) VALUES (?)", [(n,) for n in committees])
+        self.conn.executemany(
+            """INSERT INTO requesters (name, type, committee_id)
+               VALUES (?, ?, (SELECT id FROM committees WHERE name = ?))
+               ON CONFLICT(name) DO UPDATE SET type = excluded.type, committee_id = excluded.committee_id""",
+            [(name, req_type, name) for name, req_type in zip(requesters['requester_name'],
+                                                               requesters['requester_type'])])
+        return dict(self.conn.execute("SELECT name, id FROM requesters"))
+
+    def _where(self, requester=None, year_from=None, year_to=None):
+        clauses, params = [], []
+        if requester is not None:
+            clauses.append("d.requester_id = (SELECT id FROM requesters WHERE name = ?)")
+            params.append(requester)
+        if year_from is not None:
+            clauses.append("d.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("d.year <= ?")
+            params.append(year_to)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query_documents(self, requester=None, year_from=None, year_to=None):
+        """שליפת הטבלה השטוחה (בפורמט של flatten_documents) לפי מבקש ו/או טווח שנים"""
+        where, params = self._where(requester, year_from, year_to)
+        where += (" AND " if where else " WHERE ") + "d.year IS NOT NULL"
+        df_exploded = pd.read_sql_query(
+            f"""SELECT d.id, d.year, d.date, d.title, d.link, r.name AS requester_name, r.type AS requester_type
+                FROM documents d JOIN requesters r ON r.id = d.requester_id{where}
+                ORDER BY d.id""", self.conn, params=params, index_col='id')
+
+        members = pd.read_sql_query(
+            f"""SELECT a.document_id, a.role, a.name FROM authors a
+                JOIN documents d ON d.id = a.document_id{where} AND d.requester_id IS NOT NULL
+                ORDER BY a.document_id, a.role, a.position""", self.conn, params=params)
+        for role, column in [('author', 'authors'), ('teamleader', 'teamleaders')]:
+            role_members = members[members['role'] == role]
+            positions = df_exploded.index.get_indexer(role_members['document_id'])
+            df_exploded[column] = _lists_by_position(role_members['name'].to_numpy(dtype=object), positions,
+                                                     len(df_exploded)) if len(df_exploded) else []
+        return df_exploded
+
+    def summary(self, requester=None, year_from=None, year_to=None):
+        """נתוני הסיכום של הריצה עבור אותו פילוח"""
+        where, params = self._where(requester, year_from, year_to)
+        total, missing, min_date, max_date = self.conn.execute(
+            f"""SELECT COUNT(*), SUM(d.year IS NOT NULL AND d.requester_id IS NULL), MIN(d.date_iso), MAX(d.date_iso)
+                FROM documents d{where}""", params).fetchone()
+        return {
+            'total_rows': total,
+            'missing_requester_count': missing or 0,
+            'min_dt': pd.to_datetime(min_date),
+            'max_dt': pd.to_datetime(max_date),
         }
 
-    create_requesters_dashboard(
-        df_exploded,
-        years_data,
-        unique_counts,
-        details_map,
-        "requesters.html"
-    )
+    def aggregate(self, requester=None, year_from=None, year_to=None, profiler=None, compact=False):
+        """חישוב נתוני הדשבורד מתוך המאגר (במבנה של aggregate_input)"""
+        profiler = profiler or StageProfiler(enabled=False)
+        with profiler.stage('store_query'):
+            df_exploded = self.query_documents(requester, year_from, year_to)
+            result = self.summary(requester, year_from, year_to)
+        result['valid_rows'] = len(df_exploded)
+        _aggregate_frame(df_exploded, result, profiler, compact)
+        return result
+
 
-    # הדפסת הסטטיסטיקה בסוף הריצה
+def parse_year_range(text):
+    """'2020-2026' או '2020' -> (שנה ראשונה, שנה אחרונה); משמש כ-type של --years כדי שקלט שגוי ייכשל מראש"""
+    first, _, last = text.partition('-')
+    try:
+        first, last = int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"טווח שנים לא תקין: '{text}' (למשל 2020-2026 או 2020)")
+    if first > last:
+        raise argparse.ArgumentTypeError(f"טווח שנים הפוך: '{text}'")
+    return first, last
+
+
+def print_run_summary(total_rows, valid_rows, missing_requester_count, min_dt, max_dt, date_report=None):
+    """הדפסת הסטטיסטיקה בסוף הריצה"""
+    min_date = min_dt.strftime('%d/%m/%Y') if pd.notna(min_dt) else "N/A"
+    max_date = max_dt.strftime('%d/%m/%Y') if pd.notna(max_dt) else "N/A"
     print(f"\n--- סטטיסטיקה ---")
-    print(f"סה\"כ שורות שנקראו: {len(df)}")
-    print(f"שורות תקינות (עם מבקש): {len(flattened_data)}")
+    print(f"סה\"כ שורות שנקראו: {total_rows}")
+    print(f"שורות תקינות (עם מבקש): {valid_rows}")
     print(f"שורות פגומות (ללא מבקש): {missing_requester_count}")
     print(f"טווח תאריכים: {min_date} - {max_date}")
+    if date_report:
+        formats = ", ".join(date_report['formats']) or "לא זוהה"
+        print(f"פורמט תאריכים: {formats} (פענוח חלופי: {date_report['fallback']}, "
+              f"לא פוענחו: {date_report['failed']})")
+
+
+def _read_chunks(input_file, encoding, chunksize=None):
+    """קריאת הקובץ במקטעים של chunksize שורות, או כמקטע אחד"""
+    if chunksize:
+        yield from pd.read_csv(input_file, encoding=encoding, chunksize=chunksize)
+    else:
+        yield pd.read_csv(input_file, encoding=encoding)
+
+
+def aggregate_input(input_file, chunksize=None, profiler=None, compact=False, incremental=None):
+    """
+    קריאת קובץ הקלט וחישוב כל הנתונים הנדרשים לדשבורד.
+    עם chunksize הקובץ נקרא במקטעים ונצבר הדרגתית ב-RequesterAggregator.
+    עם incremental (IncrementalAggregator) הצבירה החמה מתעדכנת רק בשורות שנוספו, השתנו או נמחקו.
+    עם compact החישוב נעשה על הייצוג הדחוס (CompactDocuments) של הטבלה השטוחה.
+    """
+    profiler = profiler or StageProfiler(enabled=False)
+    encoding = detect_encoding(input_file)
+    result = {'total_rows': 0, 'missing_requester_count': 0}
+
+    if chunksize or incremental is not None:
+        aggregator = RequesterAggregator() if incremental is None else incremental.aggregator
+        min_dt = max_dt = pd.NaT
+        date_reports = []
+
+        reader = _read_chunks(input_file, encoding, chunksize)
+        while True:
+            with profiler.stage('read_csv'):
+                chunk = next(reader, None)
+            if chunk is None:
+                break
+
+            with profiler.stage('parse_dates'):
+                chunk, date_report = add_date_columns(chunk)
+            date_reports.append(date_report)
+            result['total_rows'] += len(chunk)
+            min_dt = pd.Series([min_dt, chunk['date_dt'].min()]).min()
+            max_dt = pd.Series([max_dt, chunk['date_dt'].max()]).max()
+
+            with profiler.stage('flatten'):
+                if incremental is None:
+                    chunk_exploded, chunk_missing = flatten_documents(chunk)
+                else:
+                    incremental.update(chunk)
+            if incremental is None:
+                result['missing_requester_count'] += chunk_missing
+                with profiler.stage('aggregate'):
+                    aggregator.add(chunk_exploded)
+
+        if incremental is not None:
+            with profiler.stage('aggregate'):
+                result['missing_requester_count'] = incremental.apply()
+
+        result.update(min_dt=min_dt, max_dt=max_dt, valid_rows=aggregator.row_count,
+                      date_report=merge_date_reports(date_reports))
+        if aggregator.row_count:
+            with profiler.stage('details_map'):
+                result['details_map'] = aggregator.details_map()
+            with profiler.stage('years_data'):
+                result['years_data'] = aggregator.years_data()
+                result['unique_counts'] = aggregator.unique_counts()
+            with profiler.stage('stats'):
+                result['stats'] = aggregator.stats()
+        return result
+
+    with profiler.stage('read_csv'):
+        df = pd.read_csv(input_file, encoding=encoding)
+    with profiler.stage('parse_dates'):
+        df, date_report = add_date_columns(df)
+    with profiler.stage('flatten'):
+        df_exploded, missing_requester_count = flatten_documents(df)
+
+    result.update(
+        total_rows=len(df),
+        missing_requester_count=missing_requester_count,
+        min_dt=df['date_dt'].min(),
+        max_dt=df['date_dt'].max(),
+        valid_rows=len(df_exploded),
+        date_report=date_report,
+    )
+    _aggregate_frame(df_exploded, result, profiler, compact)
+    return result
+
+
+def _aggregate_frame(df_exploded, result, profiler, compact=False):
+    """
+    חישוב נתוני הדשבורד מתוך הטבלה השטוחה המלאה (מעדכן את result).
+    הטבלה עצמה נשמרת ב-result['documents'] לבניית דשבורדים נוספים (לא במצב compact).
+    """
+    if not len(df_exploded):
+        return
+
+    members = None
+    if compact:
+        with profiler.stage('compact'):
+            docs = CompactDocuments(df_exploded)
+        before, after = table_memory_bytes(df_exploded), docs.nbytes
+        result['memory'] = {'table_bytes': before, 'compact_bytes': after}
+        print(f"🗜️ זיכרון הטבלה השטוחה: לפני {before / 2 ** 20:.1f}MB, אחרי דחיסה {after / 2 ** 20:.1f}MB "
+              f"(חיסכון של {100 * (1 - after / before):.0f}%)")
+        df_exploded, members = docs.frame, docs.member_series()
+    else:
+        result['documents'] = df_exploded
+    # הכנת המילון המלא עבור ה-Frontend
+    with profiler.stage('details_map'):
+        result['details_map'] = build_details_map(df_exploded)
+    with profiler.stage('years_data'):
+        result['unique_counts'] = build_unique_counts(df_exploded)
+        result['years_data'] = build_years_data(df_exploded)
+    with profiler.stage('stats'):
+        result['stats'] = compute_requester_stats(df_exploded, members)
+
+
+def _load_flattened_file(input_file):
+    """
+    קריאת קובץ אחד ונרמולו לטבלה השטוחה (מופעל בתהליך נפרד במאגר התהליכים).
+    מחזיר את הטבלה עם עמודת rid, את מזהי השורות ללא מבקש, את כל מזהי הקובץ (גם של שורות
+    ללא שנה או ללא מבקש - לבחירת הקובץ הקובע לכל rid) ואת נתוני הסיכום של הקובץ.
+    """
+    df, date_report = add_date_columns(pd.read_csv(input_file, encoding=detect_encoding(input_file)))
+    df['rid'] = extract_rid(_text_column(df, 'link'))
+    df_exploded, missing_requester_count = flatten_documents(df)
+    df_exploded['rid'] = df.loc[df_exploded.index, 'rid']
+
+    missing = df['year'].notna() & ~df.index.isin(df_exploded.index)
+    return {
+        'df_exploded': df_exploded.reset_index(drop=True),
+        'missing_rids': df.loc[missing, 'rid'],
+        'rids': df['rid'].dropna().unique(),
+        'total_rows': len(df),
+        'min_dt': df['date_dt'].min(),
+        'max_dt': df['date_dt'].max(),
+        'date_report': date_report,
+    }
+
+
+def _newest_source(keys, sources):
+    """מסכה לשורות שמגיעות מהקובץ המאוחר ביותר שבו הופיע המפתח (כל השורות מאותו קובץ נשמרות)"""
+    return sources == sources.groupby(keys).transform('max')
+
+
+def aggregate_inputs(input_files, jobs=None, profiler=None, compact=False):
+    """
+    קריאה מקבילית של כמה קבצי סריקה במאגר תהליכים ומיזוגם לטבלה אחת.
+    מסמך שמופיע בכמה קבצים (לפי rid) נלקח מהקובץ המאוחר ביותר, עם כל שורותיו באותו קובץ -
+    כך שהרצה על קובץ יחיד זהה להרצה עם --input. מסמכים ללא rid מזוהים לפי מבקש, תאריך, כותרת וקישור.
+    """
+    profiler = profiler or StageProfiler(enabled=False)
+
+    with profiler.stage('read_flatten'):
+        if len(input_files) > 1 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                parts = list(executor.map(_load_flattened_file, input_files))
+        else:
+            parts = [_load_flattened_file(f) for f in input_files]
+
+    with profiler.stage('merge'):
+        # הקובץ הקובע לכל rid הוא המאוחר ביותר שבו הופיע בשורה כלשהי - גם אם שם חסר בה מבקש או
+        # שתאריכה לא פוענח - כדי שגרסה ישנה של מסמך לא תחזור כשהסריקה החדשה פוסלת אותו
+        winners = pd.concat([pd.Series(i, index=p['rids'], dtype=np.int64) for i, p in enumerate(parts)])
+        winners = winners.groupby(level=0).max()
+
+        df_exploded = pd.concat([p['df_exploded'].assign(source=i) for i, p in enumerate(parts)], ignore_index=True)
+        has_rid = df_exploded['rid'].notna()
+        key = 'doc:' + pd.util.hash_pandas_object(
+            df_exploded.loc[~has_rid, ['requester_name', 'date', 'title', 'link']], index=False).astype(str)
+        keep = pd.Series(False, index=df_exploded.index)
+        keep[has_rid] = df_exploded.loc[has_rid, 'source'].to_numpy() == \
+            winners.reindex(df_exploded.loc[has_rid, 'rid']).to_numpy()
+        keep[~has_rid] = _newest_source(key, df_exploded.loc[~has_rid, 'source'])
+        df_exploded = df_exploded[keep].drop(columns=['rid', 'source'])
+
+        # שורות ללא מבקש נספרות רק מהקובץ הקובע של ה-rid שלהן; שורות ללא rid נספרות בכל קובץ
+        missing_rids = pd.concat([p['missing_rids'].to_frame('rid').assign(source=i) for i, p in enumerate(parts)],
+                                 ignore_index=True)
+        without_rid = missing_rids['rid'].isna()
+        missing_rids = missing_rids[~without_rid]
+        missing_requester_count = int(without_rid.sum()) + \
+            int((missing_rids['source'].to_numpy() == winners.reindex(missing_rids['rid']).to_numpy()).sum())
+
+    result = {
+        'total_rows': sum(p['total_rows'] for p in parts),
+        'missing_requester_count': missing_requester_count,
+        'min_dt': pd.Series([p['min_dt'] for p in parts]).min(),
+        'max_dt': pd.Series([p['max_dt'] for p in parts]).max(),
+        'valid_rows': len(df_exploded),
+        'date_report': merge_date_reports([p['date_report'] for p in parts]),
+    }
+    _aggregate_frame(df_exploded, result, profiler, compact)
+    return result
+
+
+def _needs_documents(args):
+    """האם נדרשת הטבלה השטוחה המלאה (דשבורדי authors/teamleaders או פרוסות)"""
+    return bool(set(args.dashboards) - {'requesters'} or args.years or args.by_knesset or args.window)
+
+
+def _aggregate_with_cache(input_file, args, profiler, cache=None, incremental=None):
+    """
+    aggregate_input עם שימוש במטמון המתמשך (--cache) או במטמון קיים בזיכרון (--watch).
+    incremental: הצבירה החמה של מצב --watch; הטבלה השטוחה המלאה, כשהיא נדרשת, נבנית ממנה.
+    """
+    if cache is None:
+        if not args.cache:
+            return aggregate_input(input_file, args.chunksize, profiler, args.compact)
+        cache = DocumentCache(args.cache)
+
+    digest = file_digest(input_file)
+    if cache.file_digest == digest and cache.result:
+        print("♻️ הקובץ לא השתנה מאז הריצה הקודמת - הנתונים נלקחים מהמטמון")
+        return cache.result
+
+    if incremental is None:
+        result = aggregate_input(input_file, args.chunksize, profiler, args.compact)
+    else:
+        result = aggregate_input(input_file, args.chunksize, profiler, incremental=incremental)
+        print(f"♻️ מסמכים שנלקחו מהצבירה הקודמת: {incremental.reused_rows}")
+        if _needs_documents(args) and result['valid_rows']:
+            result['documents'] = incremental.aggregator.documents()
+    cache.save(digest, result)
+    return result
+
+
+def publish_result(result, input_file, args, profiler, year_results=None):
+    """
+    בניית הדשבורדים, הדפסת הסיכום ושמירת דוח הפרופיל (--profile) עבור תוצאת צבירה אחת.
+    year_results: תוצאות מוכנות לכל טווח שנים ({תווית: (תיאור, תוצאה)}, משליפה ממאגר לפי שנים),
+    שנבנות במקום חיתוך --years מתוך הטבלה השטוחה.
+    """
+    if not result['valid_rows']:
+        print("לא נמצאו נתוני מבקשים תקינים.")
+        # גם אם לא מצאנו כלום, עדיין כדאי להדפיס סטטיסטיקה
+        print_run_summary(result['total_rows'], 0, result['missing_requester_count'],
+                          result['min_dt'], result['max_dt'], result.get('date_report'))
+        return
+
+    build_dashboards(result, args.dashboards, args.output, args.data_mode, args.jobs, profiler)
+
+    years = args.years if year_results is None else None
+    if years or args.by_knesset or args.window:
+        with profiler.stage('slices'):
+            slices = slice_documents(result['documents'], years, args.by_knesset, args.window, args.window_step)
+            build_sliced_dashboards(result['documents'], slices, args.dashboards, args.output, args.data_mode,
+                                    args.jobs)
+    for label, (caption, year_result) in (year_results or {}).items():
+        if not year_result['valid_rows']:
+            print(f"⚠️ אין מסמכים בפרוסה {label}, מדלג")
+            continue
+        build_dashboards(year_result, args.dashboards, view_output_name(args.output, label), args.data_mode,
+                         args.jobs, profiler, caption)
+
+    print_run_summary(result['total_rows'], result['valid_rows'], result['missing_requester_count'],
+                      result['min_dt'], result['max_dt'], result.get('date_report'))
+
+    if args.profile:
+        profiler.print_summary()
+        report_name = os.path.splitext(args.output)[0] + "_profile.json"
+        with open(report_name, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION, 'input': input_file, 'created': datetime.now().isoformat(timespec='seconds'),
+                       **profiler.report()}, f, ensure_ascii=False, indent=2)
+        print(f"⏱️ דוח הפרופיל נשמר: {report_name}")
+
+
+def _file_state(path):
+    """זיהוי זול של שינוי בקובץ (שם, זמן שינוי וגודל) בלי לקרוא את תוכנו"""
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def watch_inputs(args):
+    """
+    מצב --watch: תהליך ארוך שבודק כל interval שניות אם הגיע קובץ סריקה חדש (INPUT_GLOB)
+    ובונה מחדש את הדשבורדים. צבירת המבקשים נשמרת חמה בזיכרון בין הבניות (IncrementalAggregator),
+    כך שרק מסמכים שנוספו, השתנו או נמחקו מעובדים, וקובץ שתוכנו לא השתנה אינו מעובד שוב.
+    קובצי הפלט מוחלפים באופן אטומי. קובץ נבנה רק אחרי שגודלו וזמן השינוי שלו לא השתנו
+    בין שתי בדיקות (הסורק סיים לכתוב אותו).
+    """
+    cache = DocumentCache(args.cache)
+    incremental = IncrementalAggregator()
+    built_state = pending_state = None
+    print(f"👀 מצב מעקב: בודק כל {args.interval} שניות אם נוסף קובץ {INPUT_GLOB} (Ctrl+C לעצירה)")
+    try:
+        while True:
+            input_file = get_latest_input_file()
+            state = _file_state(input_file) if input_file else None
+            if state and state != built_state and state == pending_state:
+                print(f"\n🔄 {datetime.now():%H:%M:%S} קורא נתונים מקובץ: {input_file}...")
+                profiler = StageProfiler(enabled=args.profile, trace_memory=args.profile_memory)
+                try:
+                    result = _aggregate_with_cache(input_file, args, profiler, cache, incremental)
+                    publish_result(result, input_file, args, profiler)
+                except Exception as e:
+                    # בנייה שנכשלה עלולה להשאיר צבירה מעודכנת בחלקה - הבנייה הבאה תתחיל מאפס
+                    incremental = IncrementalAggregator()
+                    print(f"❌ הבנייה מ-{input_file} נכשלה: {e}")
+                built_state = state
+            pending_state = state
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 מצב המעקב הופסק")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input")
+    parser.add_argument("--chunksize", type=int,
+                        help="קריאת הקובץ במקטעים של N שורות (זיכרון חסום עבור קבצים גדולים)")
+    parser.add_argument("--cache",
+                        help="קובץ מטמון מתמשך - כשקובץ הקלט לא השתנה מאז הריצה הקודמת הדשבורד נבנה מהתוצאות השמורות")
+    parser.add_argument("--data-mode", choices=DATA_MODES, default='inline',
+                        help="external/sharded: נתוני המודל נכתבים לקבצי JSON נפרדים ונטענים רק בפתיחת המודל; "
+                             f"assets: גם העיצוב והסקריפט, בקבצים עם גיבוב תוכן ו-.gz בתיקיית {ASSETS_DIR}")
+    parser.add_argument("--profile", action="store_true",
+                        help="מדידת זמן לכל שלב ושמירתה כדוח JSON לצד קובץ ה-HTML")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="גם מדידת זיכרון שיא לכל שלב (tracemalloc, מאט את הריצה; מפעיל את --profile)")
+    parser.add_argument("--inputs", nargs='*', metavar="GLOB",
+                        help=f"מיזוג כל קבצי הסריקה התואמים (ברירת מחדל: {INPUT_GLOB}) עם הסרת כפילויות לפי rid")
+    parser.add_argument("--jobs", type=int,
+                        help="מספר התהליכים לקריאה המקבילית ב---inputs ולבניית הדשבורדים (ברירת מחדל: מספר הליבות)")
+    parser.add_argument("--compact", action="store_true",
+                        help="חישוב על ייצוג דחוס של הטבלה השטוחה (category, int16, מערכי מחברים) והצגת החיסכון בזיכרון")
+    parser.add_argument("--store",
+                        help="מאגר SQLite: קבצי הקלט נטענים אליו והדשבורד נבנה משליפה מהמאגר")
+    parser.add_argument("--requester", help="בניית הדשבורד עבור מבקש אחד מתוך המאגר (דורש --store)")
+    parser.add_argument("--years", nargs='+', metavar="RANGE", type=parse_year_range,
+                        help="דשבורד נוסף לכל טווח שנים, למשל 2015-2019 2020-2026 (<output>_2020-2026.html)")
+    parser.add_argument("--by-knesset", action="store_true",
+                        help="דשבורד נוסף לכל כנסת לפי תאריך המסמך (<output>_k25.html)")
+    parser.add_argument("--window", type=int, metavar="YEARS",
+                        help="דשבורד נוסף לכל חלון מתגלגל של YEARS שנים, המסתיים בשנה האחרונה")
+    parser.add_argument("--window-step", type=int, default=1, help="מרווח השנים בין החלונות המתגלגלים")
+    parser.add_argument("--dashboards", nargs='+', choices=list(DASHBOARD_VIEWS), default=['requesters'],
+                        help="הדשבורדים שנבנים מאותה קליטה; authors/teamleaders נכתבים ל-<output>_<view>.html")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"תהליך ארוך שבונה מחדש את הדשבורד בכל פעם שמגיע קובץ {INPUT_GLOB} חדש")
+    parser.add_argument("--interval", type=float, default=5, help="מספר השניות בין בדיקות במצב --watch")
+    parser.add_argument("--output", default="requesters.html", help="שם קובץ ה-HTML שנוצר")
+    args = parser.parse_args()
+    args.profile = args.profile or args.profile_memory
+
+    if args.inputs is not None and (args.chunksize or args.cache):
+        parser.error("--inputs אינו נתמך יחד עם --chunksize או --cache")
+    if args.store and (args.chunksize or args.cache):
+        parser.error("--store אינו נתמך יחד עם --chunksize או --cache")
+    if args.requester and not args.store:
+        parser.error("--requester דורש --store")
+    if _needs_documents(args) and (args.chunksize or args.cache or args.compact):
+        parser.error("דשבורדי authors/teamleaders ופרוסות (--years, --by-knesset, --window) "
+                     "אינם נתמכים יחד עם --chunksize, --cache או --compact")
+    if args.window is not None and (args.window < 1 or args.window_step < 1):
+        parser.error("--window ו---window-step חייבים להיות חיוביים")
+    if args.watch and (args.input or args.inputs is not None or args.store):
+        parser.error("--watch עוקב אחרי הקובץ העדכני ביותר ואינו נתמך יחד עם --input, --inputs או --store")
+
+    if args.watch:
+        return watch_inputs(args)
+
+    profiler = StageProfiler(enabled=args.profile, trace_memory=args.profile_memory)
+    year_results = None
+    if args.store:
+        input_files = get_input_files(args.inputs) if args.inputs is not None else \
+            [f for f in [args.input or get_latest_input_file()] if f]
+        input_file = ", ".join(input_files) or args.store
+        with contextlib.closing(DocumentStore(args.store)) as store:
+            for f in input_files:
+                with profiler.stage('store_load'):
+                    loaded = store.load_scrape(f)
+                print(f"🗄️ {f}: " + (f"נטענו {loaded} שורות למאגר" if loaded else "כבר קיים במאגר"))
+            result = store.aggregate(args.requester, profiler=profiler, compact=args.compact)
+            # כל טווח שנים הוא שליפה על אינדקס השנים של המאגר, ולא חיתוך של הטבלה המלאה
+            year_results = {}
+            for first, last in args.years or []:
+                label, caption = year_slice_label(first, last)
+                year_results[label] = (caption, store.aggregate(args.requester, first, last, profiler=profiler))
+    elif args.inputs is not None:
+        input_files = get_input_files(args.inputs)
+        if not input_files: return print("❌ שגיאה: לא נמצא קובץ CSV.")
+        input_file = ", ".join(input_files)
+        print(f"קורא נתונים מ-{len(input_files)} קבצים...")
+        result = aggregate_inputs(input_files, args.jobs, profiler, args.compact)
+    else:
+        input_file = args.input if args.input else get_latest_input_file()
+        if not input_file: return print("❌ שגיאה: לא נמצא קובץ CSV.")
+        print(f"קורא נתונים מקובץ: {input_file}...")
+        result = _aggregate_with_cache(input_file, args, profiler)
+
+    publish_result(result, input_file, args, profiler, year_results)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import csv
+import json
+import os
+import random
+
+import pandas as pd
+
+import requesters
+
+# גדלי ברירת המחדל של קבצי הסריקה הסינתטיים (מספר שורות)
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+MMM_REQUESTER = "מרכז המחקר והמידע"
+
+COMMITTEES = [
+    "ועדת הכספים", "ועדת החוקה, חוק ומשפט", "ועדת החוץ והביטחון", "ועדת הכלכלה",
+    "ועדת החינוך התרבות והספורט", "ועדת העבודה והרווחה", "ועדת הבריאות",
+    "ועדת הפנים והגנת הסביבה", "ועדת העלייה, הקליטה והתפוצות", "ועדת המדע והטכנולוגיה",
+    "הוועדה לענייני ביקורת המדינה", "הוועדה לקידום מעמד האישה ולשוויון מגדרי",
+    "הוועדה המיוחדת לעובדים זרים", "הוועדה המיוחדת לזכויות הילד",
+]
+
+FIRST_NAMES = ["אבי", "בתיה", "גלעד", "דנה", "הילה", "ורד", "זיו", "חנה", "טל", "יעל",
+               "כרמית", "ליאור", "מיכל", "נועה", "עמית", "פזית", "צחי", "רונית", "שרון", "תמר"]
+LAST_NAMES = ["כהן", "לוי", "מזרחי", "פרץ", "ביטון", "דהן", "אברהם", "פרידמן", "שפירא", "גולן",
+              "אזולאי", "קליין", "ברק", "רוזן", "שלום"]
+
+TITLE_SUBJECTS = ["מדיניות הממשלה בתחום", "סקירה השוואתית בנושא", "נתונים על", "תקציב",
+                  "השלכות החקיקה בנושא", "מעקב אחר יישום", "היבטים משפטיים של", "תמונת מצב:"]
+TITLE_TOPICS = ["הדיור הציבורי", "יוקר המחיה", "משרתי המילואים", "הפשיעה בחברה הערבית",
+                "מערכת החינוך", "בריאות הנפש", "התחבורה הציבורית", "העובדים הזרים",
+                "האנרגיה המתחדשת", "הגיל השלישי", "אזורי העימות בצפון", "המשק החקלאי"]
+
+
+def _random_person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _random_requester(rng, mk_names):
+    """שם מבקש מנורמל בתמהיל הדומה לסריקה האמיתית, כולל שורות ללא מבקש"""
+    roll = rng.random()
+    if roll < 0.35:
+        return MMM_REQUESTER
+    if roll < 0.70:
+        return rng.choice(COMMITTEES)
+    if roll < 0.95:
+        return rng.choice(mk_names)
+    return ""
+
+
+def generate_scrape(path, rows, encoding='utf-8', seed=0):
+    """יצירת קובץ scrape_docs סינתטי בעמודות של הסורק"""
+    rng = random.Random(seed)
+    authors = [_random_person(rng) for _ in range(120)]
+    leaders = [_random_person(rng) for _ in range(15)]
+    mk_names = [f'ח"כ {_random_person(rng)}' for _ in range(300)] + ["הייעוץ המשפטי לכנסת"]
+
+    with open(path, 'w', encoding=encoding, errors='replace', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'date', 'title', 'author', 'additional_authors', 'teamleader',
+                         'requested_by', 'requested_by_normalized', 'additional_requesters',
+                         'category', 'summary', 'link', 'keywords'])
+        for i in range(rows):
+            rid = i + 1
+            year = rng.randint(2005, 2026)
+            date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            title = f'{rng.choice(TITLE_SUBJECTS)} {rng.choice(TITLE_TOPICS)} ({rid})'
+            if rng.random() < 0.1:
+                title = f'"{title}" - עדכון'
+            extra = rng.sample(authors, rng.choice([0, 0, 1, 1, 2, 3]))
+            requester = _random_requester(rng, mk_names)
+            writer.writerow([
+                rid, date, title, rng.choice(authors), ", ".join(extra),
+                rng.choice(leaders) if rng.random() < 0.9 else "",
+                requester, requester, "", rng.choice(TITLE_TOPICS), "",
+                f"https://main.knesset.gov.il/Activity/Info/Research/Pages/incident.aspx?rid={rid}",
+                "",
+            ])
+
+
+def benchmark_file(input_file, output_name, trace_memory=False):
+    """הרצת שלבי requesters.main על קובץ אחד ומדידת הזמן והגודל של כל שלב"""
+    profiler = requesters.StageProfiler(trace_memory=trace_memory)
+
+    with profiler.stage('detect_encoding'):
+        encoding = requesters.detect_encoding(input_file)
+    with profiler.stage('read_csv'):
+        df = pd.read_csv(input_file, encoding=encoding)
+    with profiler.stage('parse_dates'):
+        df, _ = requesters.add_date_columns(df)
+    with profiler.stage('flatten'):
+        df_exploded, _ = requesters.flatten_documents(df)
+    with profiler.stage('details_map'):
+        details_map = requesters.build_details_map(df_exploded)
+    with profiler.stage('unique_counts'):
+        unique_counts = requesters.build_unique_counts(df_exploded)
+    with profiler.stage('years_data'):
+        years_data = requesters.build_years_data(df_exploded)
+    with profiler.stage('stats'):
+        stats = requesters.compute_requester_stats(df_exploded)
+    requesters.create_requesters_dashboard(stats, years_data, unique_counts, details_map, output_name,
+                                           profiler=profiler)
+
+    # השוואת גודל הטבלה השטוחה בזיכרון מול הייצוג הדחוס (--compact)
+    table_bytes = requesters.table_memory_bytes(df_exploded)
+    compact_bytes = requesters.CompactDocuments(df_exploded).nbytes
+
+    report = profiler.report()
+    return {
+        'input': input_file,
+        'rows': len(df),
+        'valid_rows': len(df_exploded),
+        'input_bytes': os.path.getsize(input_file),
+        'output_bytes': os.path.getsize(output_name),
+        'stages': {name: entry['wall_s'] for name, entry in report['stages'].items()},
+        'memory_mb': {name: entry['peak_traced_mb'] for name, entry in report['stages'].items()},
+        'total': report['total_wall_s'],
+        'table_bytes': table_bytes,
+        'compact_bytes': compact_bytes,
+    }
+
+
+def print_report(results):
+    stages = list(results[0]['stages']) if results else []
+    print(f"\n{'rows':>9} {'encoding':>8} " + " ".join(f"{s:>13}" for s in stages)
+          + f" {'total':>9} {'html MB':>8} {'table MB':>9} {'compact MB':>10}")
+    for r in results:
+        print(f"{r['rows']:>9} {r['encoding']:>8} " + " ".join(f"{r['stages'][s]:>13.3f}" for s in stages)
+              + f" {r['total']:>9.3f} {r['output_bytes'] / 1e6:>8.2f}"
+              + f" {r['table_bytes'] / 2 ** 20:>9.1f} {r['compact_bytes'] / 2 ** 20:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="מדידת ביצועים של requesters.py על קבצי סריקה סינתטיים")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument("--encodings", nargs='+', default=['utf-8', 'cp1255'])
+    parser.add_argument("--data-dir", default="bench_data")
+    parser.add_argument("--report", default="bench_report.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="מדידת זיכרון שיא לכל שלב (tracemalloc, מאט את הריצה)")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for rows in args.sizes:
+        for encoding in args.encodings:
+            input_file = os.path.join(args.data_dir, f"scrape_docs_bench_{rows}_{encoding}.csv")
+            if not os.path.exists(input_file):
+                print(f"יוצר קובץ סינתטי: {input_file}...")
+                generate_scrape(input_file, rows, encoding, args.seed)
+
+            print(f"מודד: {input_file}...")
+            output_name = os.path.join(args.data_dir, f"requesters_bench_{rows}_{encoding}.html")
+            result = benchmark_file(input_file, output_name, args.memory)
+            result['encoding'] = encoding
+            results.append(result)
+
+    print_report(results)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'version': requesters.VERSION, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"✅ דוח הביצועים נשמר: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
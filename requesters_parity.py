@@ -0,0 +1,135 @@
+import argparse
+import io
+import sys
+
+import pandas as pd
+
+import requesters
+
+# קובץ סריקה קטן עם המקרים הבעייתיים: תאים חסרים, מחברים נוספים עם מרכאות, שורות ללא מבקש,
+# תאריכים שגויים או בפורמט אחר, כותרות עם מרכאות ומסמך כפול אצל אותו מבקש
+FIXTURE_CSV = '''id,date,title,author,additional_authors,teamleader,requested_by,requested_by_normalized,additional_requesters,category,summary,link,keywords
+1,2024-01-05,מסמך רגיל,דנה כהן,"יעל לוי, טל ברק",רון שלום,ועדת הכספים,ועדת הכספים,,x,,https://example.org/incident.aspx?rid=1,
+2,2024-02-10,"כותרת עם ""מרכאות""",,,,מרכז המחקר והמידע,מרכז המחקר והמידע,,x,,https://example.org/incident.aspx?rid=2,
+3,2023-03-15,מחברים עם מרכאות,טל ברק,"""כהן, משה"", לוי, ",nan,"ח""כ אבי גולן","ח""כ אבי גולן",,x,,https://example.org/incident.aspx?rid=3,
+4,2023-04-01,ללא מבקש,דנה כהן,,רון שלום,,,,x,,https://example.org/incident.aspx?rid=4,
+5,2023-04-02,מבקש nan,דנה כהן,,רון שלום,nan,nan,,x,,https://example.org/incident.aspx?rid=5,
+6,לא ידוע,תאריך שגוי,דנה כהן,,,ועדת הכספים,ועדת הכספים,,x,,https://example.org/incident.aspx?rid=6,
+7,2020-13-01,חודש שגוי,דנה כהן,,,ועדת הכספים,ועדת הכספים,,x,,https://example.org/incident.aspx?rid=7,
+8,,ללא תאריך,דנה כהן,,,ועדת הכספים,ועדת הכספים,,x,,https://example.org/incident.aspx?rid=8,
+9,05/06/2022,תאריך בפורמט אחר,NaN,"  ,יעל לוי",  רון שלום  ,הוועדה המיוחדת לזכויות הילד,  הוועדה המיוחדת לזכויות הילד ,,x,,,
+10,2024-01-05,מסמך רגיל,יעל לוי,,,ועדת הכספים,ועדת הכספים,,x,,https://example.org/incident.aspx?rid=1,
+11,2024-07-07,הייעוץ המשפטי,,,,הייעוץ המשפטי לכנסת,הייעוץ המשפטי לכנסת,,x,,https://example.org/incident.aspx?rid=11,
+'''
+
+
+def reference_flatten(df):
+    """הלולאה המקורית (iterrows) של בניית הטבלה השטוחה, כפי שהייתה לפני הווקטוריזציה"""
+    flattened_data = []
+    missing_requester_count = 0
+
+    for _, row in df.iterrows():
+        year = row['year']
+        if pd.isna(year): continue
+        year = int(year)
+
+        doc_authors_raw = [str(row.get('author', '')).strip()]
+        doc_authors_raw.extend([x for x in requesters.parse_csv_list(row.get('additional_authors', ''))])
+        doc_authors = [a for a in doc_authors_raw if a and a.lower() != 'nan']
+
+        leader = str(row.get('teamleader', '')).strip()
+        doc_leaders = [leader] if leader and leader.lower() != 'nan' else []
+
+        req_name = str(row.get('requested_by_normalized', '')).strip()
+        if not req_name or req_name.lower() == 'nan':
+            missing_requester_count += 1
+            continue
+
+        flattened_data.append({
+            'year': year,
+            'date': str(row['date']),
+            'title': str(row['title']).replace('"', '&quot;'),
+            'link': str(row['link']),
+            'requester_name': req_name,
+            'requester_type': requesters.classify_requester(req_name),
+            'authors': doc_authors,
+            'teamleaders': doc_leaders
+        })
+
+    return pd.DataFrame(flattened_data), missing_requester_count
+
+
+def reference_details_map(df_exploded):
+    """בניית מילון הפרטים המקורית (iterrows ובדיקת כפילות ברשימה)"""
+    details_map = {}
+    for _, row in df_exploded.iterrows():
+        name = row['requester_name']
+        if name not in details_map:
+            details_map[name] = {'years': {}, 'docs': []}
+
+        y = int(row['year'])
+        details_map[name]['years'][y] = details_map[name]['years'].get(y, 0) + 1
+
+        doc_entry = {
+            'date': row['date'],
+            'title': row['title'],
+            'link': row['link']
+        }
+        if doc_entry not in details_map[name]['docs']:
+            details_map[name]['docs'].append(doc_entry)
+    return details_map
+
+
+def _plain_docs(details_map):
+    """מילון הפרטים עם סדר המפתחות ובלי שדה search (שנוסף רק לצורך החיפוש במודל)"""
+    return [(name, list(details['years'].items()),
+             [(doc['date'], doc['title'], doc['link']) for doc in details['docs']])
+            for name, details in details_map.items()]
+
+
+def check_parity(df):
+    """השוואת flatten_documents ו-build_details_map מול הלולאות המקוריות; מחזיר רשימת הבדלים"""
+    df, _ = requesters.add_date_columns(df)
+    expected, expected_missing = reference_flatten(df)
+    actual, actual_missing = requesters.flatten_documents(df)
+
+    errors = []
+    if actual_missing != expected_missing:
+        errors.append(f"missing_requester_count: {actual_missing} != {expected_missing}")
+    try:
+        # גרסאות pandas חדשות מסיקות סוג str לעמודות הטקסט של הלולאה, ולכן משווים ערכים ולא סוגי עמודות
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected, check_dtype=False)
+    except AssertionError as e:
+        errors.append(f"df_exploded: {e}")
+
+    # הרשימה החדשה ממוינת מהחדש לישן (מיון יציב), ולכן ההשוואה היא מול הרשימה המקורית אחרי אותו מיון
+    expected_map = requesters.sort_docs_by_date(reference_details_map(expected))
+    if _plain_docs(requesters.build_details_map(actual)) != _plain_docs(expected_map):
+        errors.append("details_map: המילון שונה מהלולאה המקורית")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="בדיקת התאמה של בניית הטבלה השטוחה מול הלולאה המקורית")
+    parser.add_argument("--input", nargs='*', default=[], help="קובצי סריקה נוספים לבדיקה (מעבר לקובץ הבדיקה המובנה)")
+    args = parser.parse_args()
+
+    sources = [('fixture', pd.read_csv(io.StringIO(FIXTURE_CSV)))]
+    for path in args.input:
+        sources.append((path, pd.read_csv(path, encoding=requesters.detect_encoding(path))))
+
+    failed = False
+    for name, df in sources:
+        errors = check_parity(df)
+        if errors:
+            failed = True
+            print(f"❌ {name}:")
+            for error in errors:
+                print(f"   {error}")
+        else:
+            print(f"✅ {name}: {len(df)} שורות, זהה ללולאה המקורית")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import argparse
+import functools
+import glob
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import requesters
+
+# תיקיית סדר היום וקבצי המקור (הקובץ העדכני ביותר מכל סוג)
+SEDER_HAYOM_DIR = "seder_hayom"
+VAADOT_GLOB = "*_vaadot_k*.csv"
+LAWS_GLOB = "*_law_proposals_k*.csv"
+
+# ציון מינימלי להכללה ומספר הפריטים המרבי לכל נושא. פריט נכלל רק אם נמצא בו גם אחד ממונחי
+# הליבה של הנושא (core ב-manifest.json) - מונחי הקשר (מילואים, חברה ערבית) לבדם אינם מספיקים
+MIN_SCORE = 60
+MAX_SCORE = 100
+MAX_MEETINGS = 100
+MAX_LAWS = 10
+
+# אותיות שימוש שעשויות להופיע בתחילת מילה (ו, ה, ב, ל, מ, ש, כ)
+HEBREW_PREFIXES = "והבלמשכ"
+MAX_PREFIX_LENGTH = 2
+MIN_STEM_LENGTH = 2
+
+# גרשיים ומרכאות נמחקים כדי ש-צה"ל, צה״ל ו-צהל יהיו אותה מילה
+_QUOTES_RE = re.compile(r"[\"'״׳`]")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """פירוק טקסט עברי למילים מנורמלות (ללא גרשיים, אותיות לטיניות קטנות)"""
+    if not isinstance(text, str):
+        return []
+    return _TOKEN_RE.findall(_QUOTES_RE.sub('', text).lower())
+
+
+@functools.lru_cache(maxsize=None)
+def token_variants(token):
+    """המילה עצמה ועוד הגרסאות שלה ללא אותיות שימוש בתחילתה (בחברה -> חברה)"""
+    variants = [token]
+    stem = token
+    for _ in range(MAX_PREFIX_LENGTH):
+        if stem[0] not in HEBREW_PREFIXES or len(stem) - 1 < MIN_STEM_LENGTH:
+            break
+        stem = stem[1:]
+        variants.append(stem)
+    return tuple(variants)
+
+
+class TopicIndex:
+    """
+    אינדקס הפוך על טקסטים: כל מילה (וכל גרסה שלה ללא אותיות שימוש) ממופה למסמכים שבהם הופיעה.
+    הטקסטים מפורקים פעם אחת; כל שאילתת נושא אחר כך היא חיתוך של רשימות מסמכים ולא סריקה מלאה.
+    """
+
+    def __init__(self, texts):
+        self.size = len(texts)
+        self.documents = [tokenize(text) for text in texts]
+        postings = {}
+        for doc_id, tokens in enumerate(self.documents):
+            for token in tokens:
+                for variant in token_variants(token):
+                    doc_ids = postings.setdefault(variant, [])
+                    if not doc_ids or doc_ids[-1] != doc_id:
+                        doc_ids.append(doc_id)
+        self.postings = {term: np.array(doc_ids, dtype=np.int32) for term, doc_ids in postings.items()}
+
+    def _contains_phrase(self, doc_id, words):
+        tokens = self.documents[doc_id]
+        for start in range(len(tokens) - len(words) + 1):
+            if all(word in token_variants(tokens[start + k]) for k, word in enumerate(words)):
+                return True
+        return False
+
+    def search(self, term):
+        """מספרי המסמכים שמכילים את המונח; מונח של כמה מילים נבדק כרצף מילים צמוד"""
+        words = tokenize(term)
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        candidates = self.postings.get(words[0], np.empty(0, dtype=np.int32))
+        for word in words[1:]:
+            candidates = np.intersect1d(candidates, self.postings.get(word, np.empty(0, dtype=np.int32)),
+                                        assume_unique=True)
+        if len(words) == 1:
+            return candidates
+        return np.array([d for d in candidates if self._contains_phrase(d, words)], dtype=np.int32)
+
+    def contains_any(self, terms):
+        """מסכה למסמכים שמכילים לפחות אחד מהמונחים"""
+        mask = np.zeros(self.size, dtype=bool)
+        for term in terms:
+            mask[self.search(term)] = True
+        return mask
+
+    def score(self, terms):
+        """
+        ציון לכל מסמך לפי סכום משקלי המונחים שנמצאו בו (עד MAX_SCORE),
+        ורשימת המונחים שנמצאו בכל מסמך (לשדה keywords).
+        """
+        scores = np.zeros(self.size, dtype=np.int32)
+        matched = {}
+        for term, weight in terms.items():
+            doc_ids = self.search(term)
+            scores[doc_ids] += weight
+            for doc_id in doc_ids:
+                matched.setdefault(int(doc_id), []).append(term)
+        return np.minimum(scores, MAX_SCORE), matched
+
+
+def get_latest_file(directory, pattern):
+    """הקובץ העדכני ביותר בתיקייה לפי התבנית (שמות הקבצים מתחילים בתאריך)"""
+    files = glob.glob(os.path.join(directory, pattern))
+    return sorted(files)[-1] if files else None
+
+
+def read_source_csv(path):
+    """קריאת קובץ מקור בקידוד שזוהה; utf-8-sig מסיר את ה-BOM שבתחילת קובץ הצעות החוק"""
+    encoding = requesters.detect_encoding(path)
+    return pd.read_csv(path, encoding='utf-8-sig' if encoding == 'utf-8' else encoding, dtype=str)
+
+
+def load_meetings(path):
+    """
+    טעינת ישיבות הוועדות ואיחוד ישיבות חוזרות באותו נושא ובאותה ועדה לשורה אחת,
+    במבנה של קבצי vaadot_*.json (MeetingsCount, FromDate, ToDate).
+    """
+    df = read_source_csv(path)
+    df['ItemSubject'] = df['title'].fillna('').str.split().str.join(' ')
+    df['parsed_date'], _ = requesters.parse_dates(df['date'])
+    df = df.dropna(subset=['parsed_date']).sort_values('parsed_date', kind='stable')
+
+    grouped = df.groupby(['author', 'ItemSubject'], sort=False)
+    meetings = grouped.agg(
+        ID=('idCode', 'last'),
+        CategoryId=('committeeCategoryId', 'last'),
+        FromDate=('parsed_date', 'min'),
+        ToDate=('parsed_date', 'max'),
+        MeetingsCount=('idCode', 'size'),
+        FkKnessetId=('knesset', 'last'),
+    ).reset_index().rename(columns={'author': 'CommitteeName'})
+
+    meetings['ID'] = meetings['ID'].str.replace('committee_', '', regex=False)
+    meetings['CategoryId'] = pd.to_numeric(meetings['CategoryId'], errors='coerce').fillna(0).astype(int)
+    meetings['FkKnessetId'] = pd.to_numeric(meetings['FkKnessetId'], errors='coerce').fillna(0).astype(int)
+    meetings['FromDate'] = meetings['FromDate'].dt.strftime('%Y-%m-%d')
+    meetings['ToDate'] = meetings['ToDate'].dt.strftime('%Y-%m-%d')
+    return meetings
+
+
+def load_laws(path):
+    """טעינת הצעות החוק; הטקסט לאינדקס הוא שם ההצעה ותקצירה"""
+    df = read_source_csv(path).fillna('')
+    parsed, _ = requesters.parse_dates(df['דיון אחרון'])
+    df['date'] = parsed.dt.strftime('%d/%m/%Y').fillna('')
+    df['text'] = df['שם'] + ' ' + df['תקציר לחוק שהתקבל']
+    return df
+
+
+def _law_id(row):
+    """מזהה ההצעה (למשל פ/1234/25); אם חסר - מספר החוברת לקריאה ראשונה או שם ההצעה"""
+    for column in ['מספר פרטית', 'מספר חוברת לקריאה ראשונה']:
+        value = row[column].strip('() ')
+        if value:
+            return value
+    return row['שם']
+
+
+def _law_item(row, score, keywords):
+    """המרת הצעת חוק לפריט activeLaw כמתואר בפרומפט שב-README"""
+    link = row['קישור'] if row['קישור'].startswith('http') else ''
+    return {
+        'date': row['date'],
+        'relevance': max(1, round(score / 10)),
+        'type': 'activeLaw',
+        'idCode': _law_id(row),
+        'link': link,
+        'author': row['ועדה מטפלת'],
+        'title': row['שם'],
+        'summary': row['תקציר לחוק שהתקבל'],
+        'keywords': keywords[:4],
+        'activeLawStatus': row['סטטוס'],
+        'activeLawType': row['סוג הצעת חוק'],
+        'activeLawVaada': row['ועדה מטפלת'],
+    }
+
+
+def _top_matches(scores, has_core, dates, limit):
+    """
+    מספרי הפריטים שעברו את הציון המינימלי ומכילים מונח ליבה, לפי ציון ואחר כך תאריך (מהחדש לישן).
+    פריטים ללא תאריך באים אחרי כל הפריטים המתוארכים בעלי אותו ציון.
+    """
+    selected = np.flatnonzero((scores >= MIN_SCORE) & has_core)
+    undated = dates.isna().to_numpy()[selected]
+    # NaT הופך ל-INT64_MIN, ששלילתו היא שוב INT64_MIN - לכן הוא מוחלף ב-0 ונמיין לפי undated לפני התאריך
+    timestamps = np.where(undated, 0, dates.to_numpy(dtype='datetime64[ns]').astype('int64')[selected])
+    order = np.lexsort((-timestamps, undated, -scores[selected]))
+    return selected[order][:limit]
+
+
+def build_topic(topic, meetings, meetings_index, laws, laws_index, timestamp):
+    """שאילתת נושא אחד מול שני האינדקסים: מחזיר את תוכן vaadot_<id>.json ואת פריטי activeLaw"""
+    terms, core = topic['terms'], topic['core']
+
+    scores, _ = meetings_index.score(terms)
+    dates = pd.to_datetime(meetings['FromDate'])
+    selected = _top_matches(scores, meetings_index.contains_any(core), dates, MAX_MEETINGS)
+    records = meetings.iloc[selected][['ID', 'CategoryId', 'CommitteeName', 'ItemSubject', 'FromDate', 'ToDate',
+                                       'MeetingsCount', 'FkKnessetId']].to_dict('records')
+    for record, position in zip(records, selected):
+        record['Score'] = int(scores[position])
+    vaadot = {'update_timestamp': timestamp, 'topic_name': topic['title'], 'meetings': records}
+
+    scores, matched = laws_index.score(terms)
+    dates = pd.to_datetime(laws['date'], format='%d/%m/%Y', errors='coerce')
+    law_items = [_law_item(laws.iloc[i], int(scores[i]), matched[int(i)])
+                 for i in _top_matches(scores, laws_index.contains_any(core), dates, MAX_LAWS)]
+    return vaadot, law_items
+
+
+def merge_law_items(data, law_items):
+    """
+    מיזוג הצעות החוק שנמצאו לפריטי appConfiguration.items של קובץ data_<id>.json.
+    הפריטים שנערכו ידנית נשמרים; פריטים שנוצרו בריצה קודמת (autoGenerated) מוחלפים,
+    והצעה שכבר מופיעה בין הפריטים הידניים (לפי idCode) אינה נוספת שוב.
+    """
+    items = [item for item in data['appConfiguration']['items'] if not item.get('autoGenerated')]
+    curated_ids = {item.get('idCode') for item in items}
+    added = [{**item, 'autoGenerated': True} for item in law_items if item['idCode'] not in curated_ids]
+    data['appConfiguration']['items'] = items + added
+    return len(added)
+
+
+def _write_json(path, data, indent=4):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="יצירת קבצי הנושאים של סדר היום מקובצי ה-CSV הגולמיים")
+    parser.add_argument("--dir", default=SEDER_HAYOM_DIR, help="תיקיית סדר היום (manifest.json וקובצי המקור)")
+    parser.add_argument("--vaadot", help="קובץ ישיבות הוועדות (ברירת מחדל: העדכני ביותר בתיקייה)")
+    parser.add_argument("--laws", help="קובץ הצעות החוק (ברירת מחדל: העדכני ביותר בתיקייה)")
+    parser.add_argument("--topics", nargs='+', help="מזהי הנושאים לבנייה (ברירת מחדל: כל הנושאים ב-manifest.json)")
+    args = parser.parse_args()
+
+    vaadot_file = args.vaadot or get_latest_file(args.dir, VAADOT_GLOB)
+    laws_file = args.laws or get_latest_file(args.dir, LAWS_GLOB)
+    if not vaadot_file or not laws_file:
+        print(f"❌ לא נמצאו קובצי מקור ({VAADOT_GLOB}, {LAWS_GLOB}) בתיקייה {args.dir}")
+        return
+
+    with open(os.path.join(args.dir, "manifest.json"), encoding='utf-8') as f:
+        topics = json.load(f)['dashboards']
+    if args.topics:
+        topics = [t for t in topics if t['id'] in args.topics]
+
+    print(f"בונה אינדקס מתוך {vaadot_file} ו-{laws_file}...")
+    meetings = load_meetings(vaadot_file)
+    laws = load_laws(laws_file)
+    meetings_index = TopicIndex(meetings['ItemSubject'].tolist())
+    laws_index = TopicIndex(laws['text'].tolist())
+
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for topic in topics:
+        if not topic.get('terms') or not topic.get('core'):
+            print(f"⚠️ לנושא {topic['id']} לא הוגדרו מונחים (terms) ומונחי ליבה (core) ב-manifest.json, מדלג")
+            continue
+        vaadot, law_items = build_topic(topic, meetings, meetings_index, laws, laws_index, timestamp)
+        _write_json(os.path.join(args.dir, f"vaadot_{topic['id']}.json"), vaadot)
+
+        # הצעות החוק נכנסות לקובץ הנתונים שהדשבורד כבר טוען (data_<id>.json), לצד הפריטים הידניים
+        data_file = os.path.join(args.dir, topic['file'])
+        if not os.path.exists(data_file):
+            print(f"⚠️ {topic['id']}: קובץ הנתונים {data_file} לא נמצא, הצעות החוק לא נוספו")
+            added = 0
+        else:
+            with open(data_file, encoding='utf-8') as f:
+                data = json.load(f)
+            added = merge_law_items(data, law_items)
+            _write_json(data_file, data, indent=2)
+        print(f"✅ {topic['id']}: {len(vaadot['meetings'])} ישיבות, {added} הצעות חוק נוספו ל-{topic['file']}")
+
+
+if __name__ == "__main__":
+    main()